@@ -0,0 +1,244 @@
+"""Throughput and latency of the main API scenarios, saved as JSON per commit.
+
+Seeds --users confirmed users with --contacts contacts each into DB_URL
+(existing rows are kept), then runs each scenario for --requests requests at
+--concurrency and reports RPS and p50/p95/p99:
+
+    python benchmarks/api_load.py --users 1000 --contacts 10000 --create-schema
+    python benchmarks/api_load.py --url http://127.0.0.1:8000 --skip-seed
+
+Without --url the app runs in-process over httpx.ASGITransport. For a uvicorn
+target start it with RATE_LIMIT_ENABLED=False, otherwise login and search
+quickly turn into 429s. Results go to benchmarks/results/<time>-<commit>.json;
+pass --baseline <file> to print the change against an earlier run.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, UTC
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+os.environ.setdefault("MAIL_DISPATCHER_ENABLED", "False")
+
+import httpx  # noqa: E402
+from login_storm import percentile  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from src.database.db import sessionmanager  # noqa: E402
+from src.database.models import Base, Contact, User, birthday_ordinal  # noqa: E402
+from src.services.hashing import hash_password  # noqa: E402
+
+PASSWORD = "bench-password"
+PREFIX = "bench_load"
+SCENARIOS = ("login", "list", "search", "birthdays", "create", "update")
+
+
+def username(i: int) -> str:
+    return f"{PREFIX}_{i}"
+
+
+def contact_rows(user_id: int, start: int, stop: int):
+    for i in range(start, stop):
+        birth_date = date(1970 + i % 40, 1 + i % 12, 1 + i % 28)
+        yield {
+            "first_name": f"First{i}",
+            "last_name": f"Last{i % 5000}",
+            "email": f"contact{i}@example.com",
+            "phone": f"+380{i:09d}",
+            "birth_date": birth_date,
+            "birthday_doy": birthday_ordinal(birth_date),
+            "user_id": user_id,
+        }
+
+
+async def seed(users: int, contacts: int, create_schema: bool):
+    if create_schema:
+        async with sessionmanager._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    hashed = hash_password(PASSWORD)
+    async with sessionmanager.session() as db:
+        existing = set(await db.scalars(select(User.username).where(User.username.like(f"{PREFIX}_%"))))
+        missing = [
+            {"username": username(i), "email": f"{username(i)}@example.com",
+             "hashed_password": hashed, "confirmed": True}
+            for i in range(users) if username(i) not in existing
+        ]
+        if missing:
+            await db.execute(insert(User), missing)
+            await db.commit()
+
+        counts = dict((await db.execute(
+            select(User.id, func.count(Contact.id))
+            .outerjoin(Contact, Contact.user_id == User.id)
+            .where(User.username.in_([username(i) for i in range(users)]))
+            .group_by(User.id)
+        )).all())
+        for user_id, count in counts.items():
+            rows = contact_rows(user_id, count, contacts)
+            while batch := list(itertools.islice(rows, 5000)):
+                await db.execute(insert(Contact), batch)
+            await db.commit()
+
+
+async def login(client, i: int) -> str:
+    r = await client.post("/api/auth/login", data={"username": username(i), "password": PASSWORD})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+class Session:
+    def __init__(self, token: str, contact_ids: list[int]):
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.contact_ids = contact_ids
+
+
+async def prepare(client, args) -> list[Session]:
+    sessions = []
+    for i in range(min(args.sessions, args.users)):
+        token = await login(client, i)
+        r = await client.get("/api/contacts/?limit=100", headers={"Authorization": f"Bearer {token}"})
+        r.raise_for_status()
+        sessions.append(Session(token, [contact["id"] for contact in r.json()]))
+    return sessions
+
+
+def scenario_request(name: str, args, sessions: list[Session], counter):
+    session = random.choice(sessions)
+    if name == "login":
+        i = random.randrange(min(args.sessions, args.users))
+        return "POST", "/api/auth/login", {"data": {"username": username(i), "password": PASSWORD}}
+    if name == "list":
+        return "GET", "/api/contacts/", {"params": {"limit": 50, "skip": random.randrange(0, 500, 50)}, "headers": session.headers}
+    if name == "search":
+        return "GET", "/api/contacts/search", {"params": {"q": f"Last{random.randrange(5000)}"}, "headers": session.headers}
+    if name == "birthdays":
+        return "GET", "/api/contacts/upcoming-birthdays", {"params": {"days": 30}, "headers": session.headers}
+    n = next(counter)
+    body = {
+        "first_name": "Bench",
+        "last_name": f"Run{n}",
+        "email": f"bench-{os.getpid()}-{time.time_ns()}-{n}@example.com",
+        "phone": f"+1{time.time_ns() % 10**12:012d}{n}",
+        "birth_date": "1990-05-17",
+    }
+    if name == "create":
+        return "POST", "/api/contacts/", {"json": body, "headers": session.headers}
+    return "PUT", f"/api/contacts/{random.choice(session.contact_ids)}", {"json": body, "headers": session.headers}
+
+
+async def run_scenario(client, name: str, args, sessions: list[Session]) -> dict:
+    latencies, errors = [], 0
+    counter = itertools.count()
+    remaining = iter(range(args.requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, url, kwargs = scenario_request(name, args, sessions, counter)
+            start = time.perf_counter()
+            r = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if r.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies),
+    }
+
+
+async def drive(client, args) -> dict:
+    sessions = await prepare(client, args)
+    results = {}
+    for name in args.scenarios:
+        results[name] = await run_scenario(client, name, args, sessions)
+        r = results[name]
+        print(f"{name:>10}: {r['rps']:8.1f} rps  p50 {r['p50_ms']:7.1f}  p95 {r['p95_ms']:7.1f}  "
+              f"p99 {r['p99_ms']:7.1f} ms  errors {r['errors']}")
+    return results
+
+
+def git_commit() -> dict:
+    def git(*cmd):
+        return subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def compare(results: dict, baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text())["scenarios"]
+    print(f"vs {baseline_path}")
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        b = baseline[name]
+        print(f"{name:>10}: rps {(r['rps'] / b['rps'] - 1) * 100:+6.1f}%  "
+              f"p95 {(r['p95_ms'] / b['p95_ms'] - 1) * 100:+6.1f}%  p99 {(r['p99_ms'] / b['p99_ms'] - 1) * 100:+6.1f}%")
+
+
+async def main(args):
+    if not args.skip_seed:
+        await seed(args.users, args.contacts, args.create_schema)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            results = await drive(client, args)
+    else:
+        from main import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                results = await drive(client, args)
+    await sessionmanager.close()
+
+    report = {
+        **git_commit(),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "target": args.url or "asgi",
+        "database": sessionmanager._engine.dialect.name,
+        "params": {key: getattr(args, key) for key in ("users", "contacts", "requests", "concurrency", "sessions")},
+        "scenarios": results,
+    }
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    path = output / f"{datetime.now(UTC):%Y%m%dT%H%M%S}-{report['commit'][:8]}.json"
+    path.write_text(json.dumps(report, indent=2))
+    print(f"saved {path}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--contacts", type=int, default=1000, help="contacts per user")
+    parser.add_argument("--sessions", type=int, default=20, help="users logged in to drive the scenarios")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables (SQLite runs)")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--output", default=str(ROOT / "benchmarks" / "results"))
+    parser.add_argument("--baseline", help="earlier results file to compare with")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,64 @@
+"""Rendering N verification emails three ways:
+
+* a fresh Environment per message, as fastapi_mail did per FastMail(conf)
+* one compiled Template rendered per message
+* TemplateRegistry.render_many over cached static segments
+
+    python benchmarks/email_templates.py --emails 10000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape  # noqa: E402
+
+from src.services.mail_templates import TEMPLATE_FOLDER, TemplateRegistry  # noqa: E402
+
+NAME = "verify_email.html"
+
+
+def contexts(count: int) -> list[dict]:
+    return [
+        {"host": "http://127.0.0.1:8000/", "username": f"user{i}", "token": f"token-{i:08d}"}
+        for i in range(count)
+    ]
+
+
+def fresh_environment(items):
+    for context in items:
+        env = Environment(loader=FileSystemLoader(TEMPLATE_FOLDER), autoescape=select_autoescape(["html"]))
+        env.get_template(NAME).render(context)
+
+
+def compiled_template(items):
+    template = Environment(
+        loader=FileSystemLoader(TEMPLATE_FOLDER), autoescape=select_autoescape(["html"])
+    ).get_template(NAME)
+    for context in items:
+        template.render(context)
+
+
+def registry(items):
+    registry = TemplateRegistry(TEMPLATE_FOLDER)
+    registry.load()
+    registry.render_many(NAME, items)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--emails", type=int, default=10_000)
+    args = parser.parse_args()
+
+    items = contexts(args.emails)
+    for label, fn in (
+        ("fresh Environment", fresh_environment),
+        ("compiled Template", compiled_template),
+        ("registry.render_many", registry),
+    ):
+        start = time.perf_counter()
+        fn(items)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>22}: {elapsed * 1000:8.1f} ms  ({args.emails / elapsed:,.0f} emails/s)")
@@ -0,0 +1,93 @@
+"""Access-token verifications per second, three ways:
+
+* jwt.decode with the raw secret / PEM, as get_current_user used to do
+* TokenService with the key parsed once, cache disabled
+* TokenService with the verified-token cache (steady state: every token hit)
+
+    python benchmarks/jwt_verify.py --tokens 1000 --rounds 20
+
+HS256 always runs; RS256 and ES256 run with keys generated into a temp dir.
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec, rsa  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from src.services.tokens import TokenService  # noqa: E402
+
+SECRET = "benchmark-secret"
+
+
+def write_key(directory: Path, name: str, key) -> str:
+    path = directory / f"{name}.pem"
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    return str(path)
+
+
+def services(directory: Path) -> dict[str, TokenService]:
+    rsa_key = write_key(directory, "rs256", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    ec_key = write_key(directory, "es256", ec.generate_private_key(ec.SECP256R1()))
+    return {
+        "HS256": TokenService("HS256", SECRET),
+        "RS256": TokenService("RS256", SECRET, rsa_key),
+        "ES256": TokenService("ES256", SECRET, ec_key),
+    }
+
+
+def raw_key(service: TokenService):
+    if service.kid is None:
+        return SECRET
+    return service.verifying_key.to_pem().decode()
+
+
+async def measure(fn, tokens, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            await fn(token)
+    return len(tokens) * rounds / (time.perf_counter() - start)
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        for algorithm, service in services(Path(directory)).items():
+            expire = datetime.now(UTC) + timedelta(hours=1)
+            tokens = [service.encode({"sub": f"user{i}", "exp": expire}) for i in range(args.tokens)]
+            key = raw_key(service)
+
+            async def jose_decode(token):
+                jwt.decode(token, key, algorithms=[algorithm])
+
+            async def prepared(token):
+                jwt.decode(token, service.verifying_key, algorithms=[algorithm])
+
+            rounds = args.rounds if algorithm == "HS256" else max(1, args.rounds // 10)
+            results = {
+                "jwt.decode": await measure(jose_decode, tokens, rounds),
+                "prepared key": await measure(prepared, tokens, rounds),
+            }
+            await measure(service.decode, tokens, 1)
+            results["cached"] = await measure(service.decode, tokens, args.rounds)
+            print(algorithm)
+            for label, ops in results.items():
+                print(f"  {label:>12}: {ops:12,.0f} verifications/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
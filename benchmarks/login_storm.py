@@ -0,0 +1,84 @@
+"""p99 latency of GET /api/contacts/ while a burst of logins is running.
+
+Run against a live server seeded with a confirmed user:
+
+    python benchmarks/login_storm.py --url http://127.0.0.1:8000 \
+        --username bench --password bench --logins 200 --concurrency 50
+
+Compare HASH_POOL_KIND / HASH_POOL_WORKERS settings, or the previous commit
+where bcrypt ran on the event loop.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def login(client, username, password):
+    r = await client.post(
+        "/api/auth/login", data={"username": username, "password": password}
+    )
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def storm(client, args, stop):
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with semaphore:
+            await client.post(
+                "/api/auth/login",
+                data={"username": args.username, "password": args.password},
+            )
+
+    await asyncio.gather(*(one() for _ in range(args.logins)))
+    stop.set()
+
+
+async def probe(client, token, stop):
+    latencies = []
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        start = time.perf_counter()
+        r = await client.get("/api/contacts/", headers=headers)
+        r.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        token = await login(client, args.username, args.password)
+        stop = asyncio.Event()
+        started = time.perf_counter()
+        latencies, _ = await asyncio.gather(
+            probe(client, token, stop), storm(client, args, stop)
+        )
+        elapsed = time.perf_counter() - started
+
+    print(f"logins: {args.logins} in {elapsed:.2f}s")
+    print(f"contacts requests: {len(latencies)}")
+    print(f"p50: {statistics.median(latencies):.1f} ms")
+    print(f"p99: {percentile(latencies, 99):.1f} ms")
+    print(f"max: {max(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
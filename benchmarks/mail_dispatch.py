@@ -0,0 +1,139 @@
+"""MailDispatcher against a local aiosmtpd server: delivery rate and retries.
+
+Enqueues --messages verification emails plus one to a recipient the server
+rejects, runs the dispatcher until the queue drains and checks that
+
+* every good message reached the server exactly once and is marked sent
+* the rejected one was retried with exponential backoff and ends up failed
+  after MAIL_MAX_ATTEMPTS
+
+    python benchmarks/mail_dispatch.py --messages 500
+
+Uses a throwaway SQLite database unless DB_URL is set and exits non-zero
+when a check fails.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+REJECTED = "rejected@example.com"
+os.environ.setdefault("DB_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/mail.db")
+os.environ.setdefault("JWT_SECRET", "mail-dispatch")
+os.environ.setdefault("CLD_NAME", "-")
+os.environ.update(
+    MAIL_SERVER="127.0.0.1",
+    MAIL_PORT=str(free_port()),
+    MAIL_SSL_TLS="False",
+    MAIL_STARTTLS="False",
+    USE_CREDENTIALS="False",
+    MAIL_POLL_INTERVAL_SECONDS="0.05",
+    MAIL_RETRY_BASE_SECONDS="0.2",
+    MAIL_MAX_ATTEMPTS="3",
+)
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from src.conf.config import settings  # noqa: E402
+from src.database.db import sessionmanager  # noqa: E402
+from src.database.models import Base, EmailOutbox  # noqa: E402
+from src.services.email import enqueue_verification_email  # noqa: E402
+from src.services.mail_dispatcher import mail_dispatcher  # noqa: E402
+
+
+class Handler:
+    def __init__(self):
+        self.delivered: list[str] = []
+        self.rejections: list[float] = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REJECTED:
+            self.rejections.append(time.monotonic())
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+async def seed(count: int):
+    async with sessionmanager._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmanager.session() as db:
+        for i in range(count):
+            await enqueue_verification_email(db, f"user{i}@example.com", f"user{i}", "http://bench/")
+        await enqueue_verification_email(db, REJECTED, "rejected", "http://bench/")
+        await db.commit()
+
+
+async def statuses() -> dict[str, int]:
+    async with sessionmanager.session() as db:
+        rows = await db.execute(select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status))
+        return dict(rows.all())
+
+
+def check(label: str, ok: bool, failures: list[str]):
+    print(f"{'ok' if ok else 'FAIL':>4}  {label}")
+    if not ok:
+        failures.append(label)
+
+
+async def main(args) -> int:
+    handler = Handler()
+    controller = Controller(handler, hostname=settings.MAIL_SERVER, port=settings.MAIL_PORT)
+    controller.start()
+    try:
+        await seed(args.messages)
+        started = time.perf_counter()
+        mail_dispatcher.start()
+        deadline = time.monotonic() + args.timeout
+        while time.monotonic() < deadline:
+            counts = await statuses()
+            if not counts.get("pending") and not counts.get("sending"):
+                break
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - started
+        await mail_dispatcher.stop()
+        counts = await statuses()
+    finally:
+        controller.stop()
+        await sessionmanager.close()
+
+    stats = mail_dispatcher.stats()
+    print(f"{len(handler.delivered)} delivered in {elapsed:.2f} s "
+          f"({len(handler.delivered) / elapsed:.0f} msg/s, {stats['smtp_connects']} SMTP connections)")
+    failures = []
+    check(f"{args.messages} messages delivered once",
+          sorted(handler.delivered) == sorted(f"user{i}@example.com" for i in range(args.messages)), failures)
+    check(f"outbox statuses {counts}", counts == {"sent": args.messages, "failed": 1}, failures)
+    check(f"rejected recipient tried {len(handler.rejections)}x",
+          len(handler.rejections) == settings.MAIL_MAX_ATTEMPTS, failures)
+    gaps = [b - a for a, b in zip(handler.rejections, handler.rejections[1:])]
+    expected = [settings.MAIL_RETRY_BASE_SECONDS * 2 ** i for i in range(len(gaps))]
+    check("retry gaps " + ", ".join(f"{gap:.2f}s" for gap in gaps) + " follow the backoff",
+          all(gap >= want for gap, want in zip(gaps, expected)), failures)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60)
+    sys.exit(asyncio.run(main(parser.parse_args())))
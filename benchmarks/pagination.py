@@ -0,0 +1,94 @@
+"""Page-N latency of offset vs keyset pagination in ContactRepository.get_contacts.
+
+Seeds one user with --contacts rows into the database from DB_URL (skipped
+when the user already has them) and then times fetching page --page:
+
+    python benchmarks/pagination.py --contacts 200000 --page 1000 --limit 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from src.database.db import sessionmanager  # noqa: E402
+from src.database.models import Contact, User, birthday_ordinal  # noqa: E402
+from src.repository.contacts import ContactRepository  # noqa: E402
+
+USERNAME = "bench_pagination"
+
+
+async def seed(count: int) -> User:
+    async with sessionmanager.session() as db:
+        user = (await db.execute(select(User).filter_by(username=USERNAME))).scalar_one_or_none()
+        if user is None:
+            user = User(username=USERNAME, email=f"{USERNAME}@example.com", hashed_password="-", confirmed=True)
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+        existing = await db.scalar(select(func.count()).where(Contact.user_id == user.id))
+        batch = []
+        for i in range(existing, count):
+            birth_date = date(1990, 1 + i % 12, 1 + i % 28)
+            batch.append({
+                "first_name": f"First{i}",
+                "last_name": f"Last{i % 5000}",
+                "email": f"contact{i}@example.com",
+                "phone": f"+380{i:09d}",
+                "birth_date": birth_date,
+                "birthday_doy": birthday_ordinal(birth_date),
+                "user_id": user.id,
+            })
+            if len(batch) == 5000:
+                await db.execute(insert(Contact), batch)
+                batch = []
+        if batch:
+            await db.execute(insert(Contact), batch)
+        await db.commit()
+        return user
+
+
+async def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(args):
+    try:
+        user = await seed(args.contacts)
+        skip = (args.page - 1) * args.limit
+
+        async with sessionmanager.session() as db:
+            repo = ContactRepository(db)
+            previous = await repo.get_contacts(skip=skip - args.limit, limit=args.limit, user=user)
+            after_id = previous[-1].id
+
+            offset_ms = await timed(lambda: repo.get_contacts(skip=skip, limit=args.limit, user=user), args.repeat)
+            keyset_ms = await timed(
+                lambda: repo.get_contacts(skip=0, limit=args.limit, user=user, after_id=after_id), args.repeat
+            )
+
+        print(f"page {args.page} (limit {args.limit}) over {args.contacts} contacts")
+        print(f"offset: {offset_ms:.2f} ms")
+        print(f"keyset: {keyset_ms:.2f} ms")
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=200_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
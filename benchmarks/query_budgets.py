@@ -0,0 +1,165 @@
+"""Runs every contacts endpoint with DB_QUERY_BUDGET_STRICT on and fails when
+any of them goes over its max_queries budget:
+
+    python benchmarks/query_budgets.py
+
+Each request is made twice, with a cold and a warm user cache, against a
+throwaway SQLite database unless DB_URL is set. A budget overrun surfaces as
+a 500 and a non-zero exit code, so the script can run as a CI step.
+
+The write endpoints are also held to an exact statement count: apart from the
+user lookup, create, update and delete must each run a single
+INSERT/UPDATE/DELETE ... RETURNING.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DB_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/budgets.db")
+os.environ.setdefault("JWT_SECRET", "query-budgets")
+os.environ.setdefault("CLD_NAME", "-")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ["DB_PROFILING_ENABLED"] = "True"
+os.environ["DB_QUERY_BUDGET_STRICT"] = "True"
+os.environ["DB_EXPLAIN_SLOW_QUERIES"] = "False"
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+os.environ["MAIL_DISPATCHER_ENABLED"] = "False"
+
+import httpx  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+
+from src.database.db import sessionmanager  # noqa: E402
+from src.database.models import Base, User  # noqa: E402
+from src.services.cache import user_cache  # noqa: E402
+from src.services.hashing import hash_password  # noqa: E402
+
+USERNAME = "bench_budgets"
+PASSWORD = "bench-password"
+
+
+def contact(n: int) -> dict:
+    return {
+        "first_name": "Budget",
+        "last_name": f"Check{n}",
+        "email": f"budget{n}@example.com",
+        "phone": f"+1555000{n:04d}",
+        "birth_date": "1990-05-17",
+    }
+
+
+async def seed():
+    async with sessionmanager._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmanager.session() as db:
+        if await db.scalar(select(User.id).filter_by(username=USERNAME)) is None:
+            db.add(User(username=USERNAME, email=f"{USERNAME}@example.com",
+                        hashed_password=hash_password(PASSWORD), confirmed=True))
+            await db.commit()
+
+
+async def create(client, headers, n: int) -> int:
+    r = await client.post("/api/contacts/", json=contact(n), headers=headers)
+    if r.status_code != 201:
+        raise RuntimeError(f"Cannot create a contact to check against: {r.status_code} {r.text}")
+    return r.json()["id"]
+
+
+async def check(client, headers) -> list[str]:
+    failures = []
+    numbers = iter(range(10_000))
+    ids = [await create(client, headers, next(numbers)) for _ in range(3)]
+
+    cases = [
+        ("POST", "/api/contacts/", lambda: "/api/contacts/", lambda: contact(next(numbers))),
+        ("GET", "/api/contacts/", lambda: "/api/contacts/", None),
+        ("GET", "/api/contacts/{id}", lambda: f"/api/contacts/{ids[0]}", None),
+        ("GET", "/api/contacts/search", lambda: "/api/contacts/search?q=Check", None),
+        ("GET", "/api/contacts/upcoming-birthdays", lambda: "/api/contacts/upcoming-birthdays?days=366", None),
+        ("PUT", "/api/contacts/{id}", lambda: f"/api/contacts/{ids[0]}", lambda: {"first_name": "Renamed"}),
+        ("DELETE", "/api/contacts/{id}", lambda: f"/api/contacts/{ids.pop()}", None),
+    ]
+    for method, label, url, body in cases:
+        for cache in ("cold", "warm"):
+            if cache == "cold":
+                await user_cache.delete(USERNAME)
+            r = await client.request(method, url(), json=body() if body else None, headers=headers)
+            ok = r.status_code < 500
+            print(f"{'ok' if ok else 'FAIL':>4}  {method:<6} {label} ({cache} user cache): {r.status_code}")
+            if not ok:
+                failures.append(f"{method} {label}")
+    return failures
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(" ".join(statement.split()))
+
+    def endpoint_statements(self) -> list[str]:
+        return [s for s in self.statements if "FROM users" not in s]
+
+
+async def check_writes(client, headers) -> list[str]:
+    failures = []
+    numbers = iter(range(9000, 10_000))
+    ids = [await create(client, headers, next(numbers)) for _ in range(3)]
+
+    cases = [
+        ("POST", lambda: "/api/contacts/", lambda: contact(next(numbers)), "INSERT INTO contacts"),
+        ("PUT", lambda: f"/api/contacts/{ids[0]}", lambda: {"first_name": "Exact"}, "UPDATE contacts"),
+        ("DELETE", lambda: f"/api/contacts/{ids.pop()}", None, "DELETE FROM contacts"),
+    ]
+    counter = StatementCounter()
+    engine = sessionmanager._engine.sync_engine
+    event.listen(engine, "after_cursor_execute", counter)
+    try:
+        for method, url, body, expected in cases:
+            for cache in ("cold", "warm"):
+                if cache == "cold":
+                    await user_cache.delete(USERNAME)
+                counter.statements.clear()
+                r = await client.request(method, url(), json=body() if body else None, headers=headers)
+                statements = counter.endpoint_statements()
+                ok = (
+                    r.status_code < 400
+                    and len(statements) == 1
+                    and statements[0].startswith(expected)
+                    and "RETURNING" in statements[0]
+                )
+                print(f"{'ok' if ok else 'FAIL':>4}  {method:<6} exact statements ({cache} user cache): "
+                      + (" | ".join(s[:40] for s in statements) or "none"))
+                if not ok:
+                    failures.append(f"{method} statement count")
+    finally:
+        event.remove(engine, "after_cursor_execute", counter)
+    return failures
+
+
+async def main() -> int:
+    from main import app
+
+    try:
+        await seed()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://budgets") as client:
+                r = await client.post("/api/auth/login", data={"username": USERNAME, "password": PASSWORD})
+                r.raise_for_status()
+                headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+                failures = await check(client, headers) + await check_writes(client, headers)
+    finally:
+        await sessionmanager.close()
+    if failures:
+        print(f"{len(failures)} request(s) over their query budget or statement count")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
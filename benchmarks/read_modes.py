@@ -0,0 +1,51 @@
+"""Memory and CPU per page: ORM entity reads vs column-row reads.
+
+Reuses the seeded user from pagination.py and reads --pages pages of
+--limit contacts in both repository modes, including JSON encoding:
+
+    python benchmarks/read_modes.py --limit 1000 --pages 50
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from pagination import seed, sessionmanager
+
+from src.repository.contacts import ContactRepository
+from src.services.serialization import dump_contacts
+
+
+async def measure(user, orm_reads: bool, limit: int, pages: int):
+    tracemalloc.start()
+    cpu_start = time.process_time()
+    async with sessionmanager.session() as db:
+        repo = ContactRepository(db, orm_reads=orm_reads)
+        after_id = None
+        for _ in range(pages):
+            contacts = await repo.get_contacts(skip=0, limit=limit, user=user, after_id=after_id)
+            if not contacts:
+                break
+            dump_contacts(contacts)
+            after_id = contacts[-1].id
+    cpu = time.process_time() - cpu_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu / pages * 1000, peak / 1024
+
+
+async def main(args):
+    try:
+        user = await seed(args.limit * args.pages)
+        for label, orm_reads in (("orm", True), ("rows", False)):
+            cpu_ms, peak_kib = await measure(user, orm_reads, args.limit, args.pages)
+            print(f"{label:>4}: {cpu_ms:.2f} ms CPU per page, peak {peak_kib:.0f} KiB")
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
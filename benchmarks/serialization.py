@@ -0,0 +1,68 @@
+"""Serialising a list of contacts: FastAPI response_model path vs dump_contacts.
+
+Needs no database; contacts are transient ORM instances:
+
+    python benchmarks/serialization.py --contacts 10000
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from src.database.models import Contact  # noqa: E402
+from src.schemas import ContactResponse  # noqa: E402
+from src.services.serialization import dump_contacts  # noqa: E402
+
+adapter = TypeAdapter(List[ContactResponse])
+
+
+def make_contacts(count: int) -> list[Contact]:
+    return [
+        Contact(
+            id=i,
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"contact{i}@example.com",
+            phone=f"+380{i:09d}",
+            birth_date=date(1990, 1 + i % 12, 1 + i % 28),
+            additional_info=None if i % 3 else "note",
+        )
+        for i in range(count)
+    ]
+
+
+def response_model_path(contacts) -> bytes:
+    # What FastAPI does for response_model=List[ContactResponse] + JSONResponse.
+    value = adapter.validate_python(contacts, from_attributes=True)
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def best_of(fn, contacts, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(contacts)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    contacts = make_contacts(args.contacts)
+    before = best_of(response_model_path, contacts, args.repeat)
+    after = best_of(dump_contacts, contacts, args.repeat)
+    print(f"{args.contacts} contacts")
+    print(f"response_model + json.dumps: {before:.1f} ms")
+    print(f"dump_contacts:               {after:.1f} ms")
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+
+from src.conf.config import settings
+
+# Production entry point:
+#
+#     gunicorn main:app -c gunicorn.conf.py
+#
+# One async worker per available CPU; WEB_CONCURRENCY overrides it. Workers
+# only share state through Redis, so with the in-memory cache or rate-limit
+# backends, or without Redis to broadcast token revocations, the server is
+# held at a single worker.
+
+
+def cpu_count() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def per_process_state() -> list[str]:
+    found = []
+    if not settings.CACHE_REDIS_URL:
+        found.append("CACHE_REDIS_URL is not set (user and response caches and token revocations are in-memory)")
+    if settings.RATE_LIMIT_STORAGE_URL.startswith("async+memory"):
+        found.append("RATE_LIMIT_STORAGE_URL is async+memory:// (limits would multiply per worker)")
+    return found
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", cpu_count()))
+startup_warnings = []
+if workers > 1 and (reasons := per_process_state()):
+    startup_warnings.append(
+        f"Running 1 worker instead of {workers}: " + "; ".join(reasons)
+    )
+    workers = 1
+if workers > 1 and settings.DB_ROUTING_MODE == "replica":
+    startup_warnings.append(
+        "Replica read-your-writes stickiness is tracked per worker; a request "
+        "routed to another worker within DB_STICKY_SECONDS may read from a replica"
+    )
+# uvicorn picks uvloop and httptools automatically when they are installed.
+worker_class = "uvicorn_worker.UvicornWorker"
+# Import the app once in the master and fork it. Engines, pools and
+# background tasks are created lazily or in the lifespan, so nothing
+# connection-bound is shared across the fork.
+preload_app = True
+# Must exceed SHUTDOWN_DRAIN_SECONDS plus the slowest request we wait for.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.getenv("WORKER_TIMEOUT", 60))
+keepalive = 5
+max_requests = int(os.getenv("MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+accesslog = "-"
+
+# Workers are separate processes, so /metrics has to aggregate their samples.
+# Reset here rather than in on_starting: with preload_app the master imports
+# the app, and creates its metric files, before on_starting runs.
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "contacts-prometheus")
+)
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def on_starting(server):
+    for message in startup_warnings:
+        server.log.warning(message)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,10 +1,47 @@
-from fastapi import FastAPI, Request, status
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import JSONResponse
-from slowapi.errors import RateLimitExceeded
-from src.api import  utils, contacts, auth, users
+from fastapi.staticfiles import StaticFiles
+from src.api import  utils, contacts, auth, users, avatars, metrics
+from src.database.db import sessionmanager
+from src.database.profiling import QueryProfilingMiddleware, profiler
+from src.services.hashing import hashing_pool
+from src.services.health import health_monitor
+from src.services.lifecycle import lifecycle
+from src.services.mail_dispatcher import mail_dispatcher
+from src.services.mail_templates import template_registry
+from src.services.metrics import MetricsMiddleware, install_db_hooks
+from src.services.revocation import revocation_list
+from src.conf.config import settings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    template_registry.load()
+    try:
+        await sessionmanager.warmup()
+    except Exception as e:
+        print(e)
+    try:
+        await revocation_list.load()
+    except Exception as e:
+        print(e)
+    revocation_list.start()
+    await health_monitor.run_checks()
+    health_monitor.start()
+    if settings.MAIL_DISPATCHER_ENABLED:
+        mail_dispatcher.start()
+    lifecycle.install_drain_handler(settings.SHUTDOWN_DRAIN_SECONDS)
+    lifecycle.mark_ready()
+    yield
+    lifecycle.draining = True
+    await health_monitor.stop()
+    await mail_dispatcher.stop()
+    await revocation_list.stop()
+    hashing_pool.shutdown()
+    await sessionmanager.close()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "<http://localhost:3000>"
@@ -18,17 +55,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"error": "Перевищено ліміт запитів. Спробуйте пізніше."},
-    )
+if settings.METRICS_ENABLED:
+    install_db_hooks()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if settings.DB_PROFILING_ENABLED:
+    profiler.install(sessionmanager.engines())
+    app.add_middleware(QueryProfilingMiddleware)
 
 app.include_router(utils.router, prefix="/api")
+if settings.INTERNAL_ENDPOINTS_ENABLED:
+    app.include_router(utils.internal_router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(avatars.router, prefix="/api")
+
+if settings.AVATAR_STORAGE == "local":
+    app.mount(
+        settings.AVATAR_LOCAL_BASE_URL,
+        StaticFiles(directory=settings.AVATAR_LOCAL_DIR, check_dir=False),
+        name="avatars",
+    )
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,38 @@
+"""contacts trigram search
+
+Revision ID: 01e17597b5b1
+Revises: bd5d1401a7e9
+Create Date: 2026-10-18 10:03:27.114902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '01e17597b5b1'
+down_revision: Union[str, None] = 'bd5d1401a7e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in ("first_name", "last_name", "email"):
+        op.create_index(
+            f"ix_contacts_{column}_trgm",
+            "contacts",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("first_name", "last_name", "email"):
+        op.drop_index(f"ix_contacts_{column}_trgm", table_name="contacts")
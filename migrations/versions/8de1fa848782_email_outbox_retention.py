@@ -0,0 +1,33 @@
+"""email outbox retention
+
+Revision ID: 8de1fa848782
+Revises: b4a352c90076
+Create Date: 2026-10-18 18:41:07.512930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8de1fa848782'
+down_revision: Union[str, None] = 'b4a352c90076'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('email_outbox', 'context', existing_type=sa.JSON(), nullable=True)
+    # Finished rows no longer keep their template context (it holds live tokens).
+    op.execute("UPDATE email_outbox SET context = NULL WHERE status IN ('sent', 'failed')")
+    op.create_index('ix_email_outbox_created_at', 'email_outbox', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_outbox_created_at', table_name='email_outbox')
+    op.execute("DELETE FROM email_outbox WHERE context IS NULL")
+    op.alter_column('email_outbox', 'context', existing_type=sa.JSON(), nullable=False)
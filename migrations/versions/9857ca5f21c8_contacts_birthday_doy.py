@@ -0,0 +1,43 @@
+"""contacts birthday_doy
+
+Revision ID: 9857ca5f21c8
+Revises: 01e17597b5b1
+Create Date: 2026-10-18 10:41:55.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9857ca5f21c8'
+down_revision: Union[str, None] = '01e17597b5b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column('birthday_doy', sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE contacts
+        SET birthday_doy = EXTRACT(
+            DOY FROM make_date(
+                2000,
+                EXTRACT(MONTH FROM birth_date)::int,
+                EXTRACT(DAY FROM birth_date)::int
+            )
+        )::int
+        """
+    )
+    op.alter_column('contacts', 'birthday_doy', nullable=False)
+    op.create_index('ix_contacts_user_id_birthday_doy', 'contacts', ['user_id', 'birthday_doy'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_id_birthday_doy', table_name='contacts')
+    op.drop_column('contacts', 'birthday_doy')
@@ -0,0 +1,52 @@
+"""contacts unique per user
+
+Revision ID: cbbb20884797
+Revises: 9857ca5f21c8
+Create Date: 2026-10-18 12:20:48.602377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cbbb20884797'
+down_revision: Union[str, None] = '9857ca5f21c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DUPLICATES = """
+    SELECT user_id, {column}, COUNT(*) FROM contacts
+    GROUP BY user_id, {column} HAVING COUNT(*) > 1
+    ORDER BY COUNT(*) DESC LIMIT 5
+"""
+
+
+def check_duplicates() -> None:
+    bind = op.get_bind()
+    problems = []
+    for column in ("email", "phone"):
+        for user_id, value, count in bind.execute(sa.text(DUPLICATES.format(column=column))):
+            problems.append(f"user_id={user_id} {column}={value!r} x{count}")
+    if problems:
+        raise RuntimeError(
+            "contacts has rows that break the new (user_id, email) / (user_id, phone) "
+            "unique constraints; merge or delete them and rerun the migration. "
+            "First duplicates: " + "; ".join(problems)
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    check_duplicates()
+    op.create_unique_constraint('unique_contact_user', 'contacts', ['user_id', 'email'])
+    op.create_unique_constraint('unique_contact_user_phone', 'contacts', ['user_id', 'phone'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('unique_contact_user_phone', 'contacts', type_='unique')
+    op.drop_constraint('unique_contact_user', 'contacts', type_='unique')
@@ -1,18 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks, Request
+from fastapi import APIRouter, HTTPException, Depends, status, Request
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
-from src.schemas import UserCreate, Token, User, RequestEmail
-from src.services.auth import create_access_token, Hash, get_email_from_token
+from src.schemas import UserCreate, Token, User, RequestEmail, RefreshRequest
+from src.services.auth import Hash, get_email_from_token
 from src.services.users import UserService
 from src.database.db import get_db
-from src.services.email import send_email
+from src.database.profiling import max_queries
+from src.services.email import enqueue_verification_email
+from src.services.mail_dispatcher import mail_dispatcher
+from src.services.rate_limit import login_limit, refresh_limit
+from src.services.refresh_tokens import RefreshTokenService
+from src.services.tokens import token_service
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
@@ -31,20 +35,30 @@ async def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail="Користувач з таким іменем вже існує",
         )
-    user_data.password = Hash().get_password_hash(user_data.password)
-    new_user = await user_service.create_user(user_data)
-    background_tasks.add_task(
-        send_email, new_user.email, new_user.username, request.base_url
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
+    await enqueue_verification_email(
+        db, user_data.email, user_data.username, request.base_url
     )
+    new_user = await user_service.create_user(user_data)
+    mail_dispatcher.notify()
     return new_user
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(login_limit), Depends(max_queries(4))],
+)
 async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await Hash().verify_and_update_async(
+            form_data.password, user.hashed_password
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неправильний логін або пароль",
@@ -55,8 +69,20 @@ async def login_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Електронна адреса не підтверджена",
         )
-    access_token = await create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+    if new_hash:
+        await user_service.update_password(user.email, new_hash)
+    return await RefreshTokenService(db).issue_tokens(user)
+
+
+@router.post("/refresh", response_model=Token, dependencies=[Depends(refresh_limit)])
+async def refresh_tokens(body: RefreshRequest, db: Session = Depends(get_db)):
+    return await RefreshTokenService(db).rotate(body.refresh_token)
+
+
+@router.post("/logout")
+async def logout(body: RefreshRequest, db: Session = Depends(get_db)):
+    await RefreshTokenService(db).revoke(body.refresh_token)
+    return {"message": "Ви вийшли з системи"}
 
 
 @router.get("/confirmed_email/{token}")
@@ -77,17 +103,21 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
 @router.post("/request_email")
 async def request_email(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
     user_service = UserService(db)
     user = await user_service.get_user_by_email(body.email)
 
-    if user.confirmed:
+    if user and user.confirmed:
         return {"message": "Ваша електронна пошта вже підтверджена"}
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, request.base_url
+        await enqueue_verification_email(
+            db, user.email, user.username, request.base_url, commit=True
         )
-    return {"message": "Перевірте свою електронну пошту для підтвердження"}
\ No newline at end of file
+        mail_dispatcher.notify()
+    return {"message": "Перевірте свою електронну пошту для підтвердження"}
+
+@router.get("/jwks.json")
+async def jwks():
+    return token_service.jwks()
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Path, Request, Response, status
+from fastapi.responses import FileResponse
+
+from src.services.thumbnails import thumbnail_store
+
+router = APIRouter(prefix="/avatars", tags=["avatars"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def not_found():
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Аватар не знайдено"
+    )
+
+
+@router.get("/{digest}/{size}", name="avatar_thumbnail")
+async def avatar_thumbnail(
+    request: Request,
+    digest: str = Path(pattern="^[0-9a-f]{64}$"),
+    size: int = Path(),
+):
+    if size not in thumbnail_store.sizes:
+        raise not_found()
+
+    etag = f'"{digest}-{size}"'
+    headers = {"Cache-Control": IMMUTABLE, "ETag": etag, "Accept-Ranges": "bytes"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if "range" in request.headers:
+        path = thumbnail_store.path(digest, size)
+        if not path.is_file():
+            raise not_found()
+        return FileResponse(path, media_type="image/jpeg", headers=headers)
+
+    data = await thumbnail_store.get(digest, size)
+    if data is None:
+        raise not_found()
+    return Response(data, media_type="image/jpeg", headers=headers)
@@ -1,46 +1,137 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, timedelta
 from src.database.db import get_db
+from src.database.profiling import max_queries
 from src.database.models import  User
 from src.services.auth import  get_current_user
 from src.repository.contacts import ContactRepository  
-from src.schemas import ContactCreate, ContactUpdate, ContactResponse
+from src.repository.pagination import decode_cursor, next_cursor
+from src.schemas import ContactCreate, ContactUpdate, ContactResponse, ContactImportReport
+from src.services.contacts_import import ContactImporter
+from src.services.contacts_export import MEDIA_TYPES, export_contacts, gzip_stream
+from src.services.rate_limit import search_limit
+from src.services.response_cache import response_cache
+from src.services.serialization import contacts_response, dump_contacts
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+router = APIRouter(prefix="/contacts", tags=["contacts"], default_response_class=ORJSONResponse)
 
-@router.get("/search", response_model=List[ContactResponse])
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+@router.get(
+    "/search",
+    response_model=List[ContactResponse],
+    dependencies=[Depends(search_limit), Depends(max_queries(3))],
+)
 async def search_contacts(
+    q: Optional[str] = None,
     name: Optional[str] = None,
     surname: Optional[str] = None,
     email: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     contact_repo = ContactRepository(db)
-    contacts = await contact_repo.search_contacts(name, surname, email, user)
-    return contacts
+    if q:
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Параметр cursor не підтримується разом з q",
+            )
+        return contacts_response(await contact_repo.search(q, user, skip=skip, limit=limit))
+    contacts = await contact_repo.search_contacts(
+        name, surname, email, user, skip=skip, limit=limit, after_id=decode_cursor(cursor)
+    )
+    cursor = next_cursor(contacts, limit)
+    return contacts_response(contacts, {"X-Next-Cursor": cursor} if cursor else None)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_contacts_file(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    user: User = Depends(get_current_user),
+):
+    body = export_contacts(user, format)
+    filename = f"contacts.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        body = gzip_stream(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-@router.get("/upcoming-birthdays", response_model=List[ContactResponse])
-async def get_upcoming_birthdays(db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),):
+@router.get(
+    "/upcoming-birthdays",
+    response_model=List[ContactResponse],
+    dependencies=[Depends(max_queries(3))],
+)
+async def get_upcoming_birthdays(request: Request, days: int = Query(7, ge=0, le=366), db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),):
     contact_repo = ContactRepository(db)
     today = date.today()
-    next_week = today + timedelta(days=7)
-    
-    return await contact_repo.get_upcoming_birthdays(today, next_week, user)
+    until = today + timedelta(days=days)
 
-@router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
+    async def produce():
+        contacts = await contact_repo.get_upcoming_birthdays(today, until, user)
+        return dump_contacts(contacts), {}
+
+    return await response_cache.respond(request, user.id, produce, extra=today.isoformat())
+
+@router.post(
+    "/",
+    response_model=ContactResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(max_queries(3))],
+)
 async def create_contact(contact: ContactCreate, db: AsyncSession = Depends(get_db),user: User = Depends(get_current_user),):
     contact_repo = ContactRepository(db) 
     return await contact_repo.create_contact(contact, user)  
 
-@router.get("/", response_model=List[ContactResponse])
-async def get_contacts(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),):
+@router.post("/import", response_model=ContactImportReport)
+async def import_contacts(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = format or IMPORT_FORMATS.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Підтримуються лише CSV та NDJSON",
+        )
+    importer = ContactImporter(ContactRepository(db), user)
+    return await importer.run(request.stream(), fmt)
+
+@router.get("/", response_model=List[ContactResponse], dependencies=[Depends(max_queries(3))])
+async def get_contacts(request: Request, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),):
     contact_repo = ContactRepository(db) 
-    return await contact_repo.get_contacts(skip=skip, limit=limit, user=user)  
+    after_id = decode_cursor(cursor)
+
+    async def produce():
+        contacts = await contact_repo.get_contacts(skip=skip, limit=limit, user=user, after_id=after_id)
+        cursor = next_cursor(contacts, limit)
+        return dump_contacts(contacts), {"X-Next-Cursor": cursor} if cursor else {}
 
-@router.get("/{contact_id}", response_model=ContactResponse)
+    return await response_cache.respond(request, user.id, produce)
+
+@router.get(
+    "/{contact_id}", response_model=ContactResponse, dependencies=[Depends(max_queries(3))]
+)
 async def get_contact_by_id(contact_id: int, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),):
     contact_repo = ContactRepository(db)
     contact = await contact_repo.get_contact_by_id(contact_id=contact_id, user=user)
@@ -48,7 +139,9 @@ async def get_contact_by_id(contact_id: int, db: AsyncSession = Depends(get_db),
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
     return contact
 
-@router.put("/{contact_id}", response_model=ContactResponse)
+@router.put(
+    "/{contact_id}", response_model=ContactResponse, dependencies=[Depends(max_queries(3))]
+)
 async def update_contact(contact_id: int, contact: ContactUpdate, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),):
     contact_repo = ContactRepository(db)
     updated_contact = await contact_repo.update_contact(contact_id=contact_id, body=contact, user=user)
@@ -56,14 +149,12 @@ async def update_contact(contact_id: int, contact: ContactUpdate, db: AsyncSessi
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
     return updated_contact
 
-@router.delete("/{contact_id}", response_model=ContactResponse)
+@router.delete(
+    "/{contact_id}", response_model=ContactResponse, dependencies=[Depends(max_queries(3))]
+)
 async def delete_contact(contact_id: int, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),):
     contact_repo = ContactRepository(db)
     contact = await contact_repo.delete_contact(contact_id=contact_id, user=user)
     if contact is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
     return contact
-
-
-
-
@@ -1,24 +1,24 @@
-from fastapi import APIRouter, Depends, Request, UploadFile, File
+from fastapi import APIRouter, Depends, UploadFile, File
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
+from src.database.profiling import max_queries
 from src.schemas import User
-from src.conf.config import settings
 from src.services.auth import get_current_user
+from src.services.rate_limit import me_limit
 from src.services.users import UserService
 from src.services.upload_file import UploadFileService
 
 router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
 
 @router.get(
-    "/me", response_model=User, description="No more than 5 requests per minute"
+    "/me",
+    response_model=User,
+    description="No more than 5 requests per minute",
+    dependencies=[Depends(me_limit), Depends(max_queries(2))],
 )
-@limiter.limit("5/minute")
-async def me(request: Request, user: User = Depends(get_current_user)):  
+async def me(user: User = Depends(get_current_user)):  
     return user
 
 @router.patch("/avatar", response_model=User)
@@ -27,9 +27,7 @@ async def update_avatar_user(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    avatar_url = UploadFileService(
-        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
-    ).upload_file(file, user.username)
+    avatar_url = await UploadFileService().upload_file(file, user.username)
 
     user_service = UserService(db)
     user = await user_service.update_avatar_url(user.email, avatar_url)
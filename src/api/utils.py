@@ -1,26 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from fastapi import APIRouter, HTTPException, Response, status
 
-from src.database.db import get_db
+from src.database.db import sessionmanager
+from src.services.cache import user_cache
+from src.services.hashing import hashing_pool
+from src.services.health import health_monitor
+from src.services.lifecycle import lifecycle
+from src.services.mail_dispatcher import mail_dispatcher
+from src.services.response_cache import response_cache
+from src.services.revocation import revocation_list
+from src.services.thumbnails import thumbnail_store
+from src.services.tokens import token_service
 
 router = APIRouter(tags=["utils"])
+# Operational stats, only mounted when INTERNAL_ENDPOINTS_ENABLED is set.
+internal_router = APIRouter(prefix="/internal", tags=["internal"])
 
 @router.get("/healthchecker")
-async def healthchecker(db: AsyncSession = Depends(get_db)):
-    try:
-        result = await db.execute(text("SELECT 1"))
-        result = result.scalar_one_or_none()
-
-        if result is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database is not configured correctly",
-            )
-        return {"message": "Welcome to FastAPI!"}
-    except Exception as e:
-        print(e)
+async def healthchecker():
+    # Answered from the health monitor's last result; probes never touch the pool.
+    if not health_monitor.healthy():
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
         )
+    return {"message": "Welcome to FastAPI!"}
+
+@router.get("/livez")
+async def livez():
+    return {"status": "alive"}
+
+@router.get("/readyz")
+async def readyz(response: Response):
+    if not lifecycle.ready or lifecycle.draining:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "draining" if lifecycle.draining else "starting"}
+    if not health_monitor.healthy():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "database unavailable"}
+    return {"status": "ready"}
+
+@router.get("/health")
+async def health(response: Response):
+    snapshot = health_monitor.snapshot()
+    if snapshot["status"] == "error":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        **snapshot,
+        "pool": sessionmanager.pool_stats(),
+        "hashing": hashing_pool.stats(),
+        "mail_queue_depth": mail_dispatcher.queue_depth,
+    }
+
+@internal_router.get("/cache")
+async def cache_stats():
+    return {
+        "user": user_cache.stats(),
+        "responses": response_cache.stats(),
+        "thumbnails": thumbnail_store.cache.stats(),
+        "tokens": token_service.cache.stats(),
+    }
+
+@internal_router.get("/hashing")
+async def hashing_stats():
+    return hashing_pool.stats()
+
+@internal_router.get("/pool")
+async def pool_stats():
+    return sessionmanager.pool_stats()
+
+@internal_router.get("/mail")
+async def mail_stats():
+    return mail_dispatcher.stats()
+
+@internal_router.get("/revocations")
+async def revocation_stats():
+    return revocation_list.stats()
@@ -1,11 +1,40 @@
+from typing import Optional
+
 from pydantic import ConfigDict, EmailStr
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DB_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: float = 10
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    DB_REPLICA_URLS: list[str] = []
+    DB_ROUTING_MODE: str = "primary"
+    DB_STICKY_SECONDS: float = 5
+    DB_PROFILING_ENABLED: bool = False
+    DB_SLOW_QUERY_MS: float = 200
+    DB_EXPLAIN_SLOW_QUERIES: bool = True
+    DB_N_PLUS_ONE_THRESHOLD: int = 5
+    DB_QUERY_BUDGET_STRICT: bool = False
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_SECONDS: int = 3600
+    JWT_PRIVATE_KEY_FILE: Optional[str] = None
+    JWT_PUBLIC_KEY_FILE: Optional[str] = None
+    JWT_VERIFY_CACHE_SIZE: int = 10000
+    JWT_REFRESH_EXPIRATION_SECONDS: int = 30 * 24 * 3600
+    REVOCATION_REFRESH_SECONDS: float = 30
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+
+    BCRYPT_ROUNDS: int = 12
+    HASH_POOL_KIND: str = "thread"
+    HASH_POOL_WORKERS: int = 4
+    HASH_POOL_MAX_QUEUE: int = 100
 
     MAIL_USERNAME: EmailStr = "example@meta.ua"
     MAIL_PASSWORD: str = "secretPassword"
@@ -17,11 +46,58 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = True
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+    MAIL_TIMEOUT_SECONDS: float = 30
+    MAIL_DISPATCHER_ENABLED: bool = True
+    MAIL_SMTP_POOL_SIZE: int = 2
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_LEASE_SECONDS: float = 300
+    MAIL_POLL_INTERVAL_SECONDS: float = 5
+    MAIL_MAX_ATTEMPTS: int = 5
+    MAIL_RETRY_BASE_SECONDS: float = 30
+    MAIL_RETRY_MAX_SECONDS: float = 3600
+    MAIL_OUTBOX_RETENTION_DAYS: float = 7
 
     CLD_NAME: str
     CLD_API_KEY: int = 326488457974591
     CLD_API_SECRET: str = "secret"
 
+    AVATAR_STORAGE: str = "cloudinary"
+    AVATAR_LOCAL_DIR: str = "media/avatars"
+    AVATAR_LOCAL_BASE_URL: str = "/media/avatars"
+    AVATAR_SIZE: int = 250
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_CHUNK_SIZE: int = 64 * 1024
+    AVATAR_UPLOAD_TIMEOUT_SECONDS: float = 20
+    AVATAR_THUMBNAIL_DIR: str = "media/thumbnails"
+    AVATAR_THUMBNAIL_BASE_URL: str = "/api/avatars"
+    AVATAR_THUMBNAIL_SIZES: list[int] = [32, 64, 128, 250]
+    AVATAR_THUMBNAIL_CACHE_MAXSIZE: int = 1024
+
+    CONTACTS_IMPORT_CHUNK_SIZE: int = 1000
+    CONTACTS_EXPORT_BATCH_SIZE: int = 1000
+
+    CACHE_REDIS_URL: Optional[str] = None
+    USER_CACHE_TTL_SECONDS: int = 300
+    USER_CACHE_MAXSIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAXSIZE: int = 10000
+
+    METRICS_ENABLED: bool = True
+    INTERNAL_ENDPOINTS_ENABLED: bool = False
+
+    SHUTDOWN_DRAIN_SECONDS: float = 5
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 10
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+    HEALTH_STORAGE_CHECK_INTERVAL_SECONDS: float = 300
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE_URL: str = "async+memory://"
+    RATE_LIMIT_STRATEGY: str = "sliding-window"
+    RATE_LIMIT_ME: str = "5/minute"
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_REFRESH: str = "30/minute"
+    RATE_LIMIT_SEARCH: str = "60/minute"
+
     model_config = ConfigDict(
         extra="ignore", env_file=".env", env_file_encoding="utf-8", case_sensitive=True
     )
@@ -1,19 +1,134 @@
+import asyncio
 import contextlib
+import random
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import Select, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.conf.config import settings 
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+def engine_options(url: str) -> dict:
+    url = make_url(url)
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if url.get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "timeout": settings.DB_CONNECT_TIMEOUT,
+        }
+    return options
+
+route_key: ContextVar[str | None] = ContextVar("route_key", default=None)
+
+class ReplicaRouter:
+    def __init__(self, primary: AsyncEngine, replicas: list[AsyncEngine], mode: str, sticky_seconds: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.enabled = mode == "replica" and bool(replicas)
+        self.sticky_seconds = sticky_seconds
+        self._sticky: dict[str, float] = {}
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    def bind_for(self, session: Session, clause=None):
+        if not self.enabled or session._flushing or session.info.get("writes"):
+            return self.primary.sync_engine
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return self.primary.sync_engine
+        if clause.get_execution_options().get("use_primary"):
+            return self.primary.sync_engine
+        if self.is_sticky(route_key.get()):
+            self.primary_reads += 1
+            return self.primary.sync_engine
+        self.replica_reads += 1
+        return random.choice(self.replicas).sync_engine
+
+    def is_sticky(self, key: str | None) -> bool:
+        return key is not None and self._sticky.get(key, 0) > time.monotonic()
+
+    def mark_write(self, key: str | None):
+        if not self.enabled or key is None:
+            return
+        now = time.monotonic()
+        if len(self._sticky) > 10000:
+            self._sticky = {k: v for k, v in self._sticky.items() if v > now}
+        self._sticky[key] = now + self.sticky_seconds
+
+class RoutingSession(Session):
+    router: ReplicaRouter
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return self.router.bind_for(self, clause)
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["writes"] = True
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flush(session, flush_context):
+    session.info["writes"] = True
+
+@event.listens_for(RoutingSession, "after_commit")
+def _mark_sticky(session):
+    # The session keeps reading from the primary after its own writes, and
+    # the current user does too for DB_STICKY_SECONDS.
+    if session.info.get("writes"):
+        session.router.mark_write(route_key.get())
+
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
-        
+    def __init__(self, url: str, replica_urls: list[str] | None = None):
+        self._engine: AsyncEngine | None = create_async_engine(url, **engine_options(url))
+        self._replicas: list[AsyncEngine] = [
+            create_async_engine(replica_url, **engine_options(replica_url))
+            for replica_url in replica_urls or []
+        ]
+        self.router = ReplicaRouter(
+            self._engine, self._replicas, settings.DB_ROUTING_MODE, settings.DB_STICKY_SECONDS
+        )
+        session_class = type("RoutingSession", (RoutingSession,), {"router": self.router})
+
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            bind=self._engine,
+            sync_session_class=session_class,
         )
 
     @contextlib.asynccontextmanager
@@ -30,11 +145,68 @@ class DatabaseSessionManager:
         finally:
             await session.close()  
 
+    async def warmup(self, connections: int | None = None):
+        if self._engine is None:
+            return
+        if connections is None:
+            connections = settings.DB_POOL_SIZE
+
+        async def ping(engine: AsyncEngine):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        await asyncio.gather(*(
+            ping(engine)
+            for engine in [self._engine, *self._replicas]
+            for _ in range(max(connections, 1))
+        ))
 
-sessionmanager = DatabaseSessionManager(settings.DB_URL)
+    async def close(self):
+        for engine in self._replicas:
+            await engine.dispose()
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    def engines(self) -> list[AsyncEngine]:
+        return [self._engine, *self._replicas]
+
+    def pool_stats(self) -> dict:
+        return {
+            "primary": self._engine_stats(self._engine),
+            "replicas": [self._engine_stats(engine) for engine in self._replicas],
+            "routing": {
+                "enabled": self.router.enabled,
+                "replica_reads": self.router.replica_reads,
+                "sticky_primary_reads": self.router.primary_reads,
+            },
+        }
+
+    @staticmethod
+    def _engine_stats(engine: AsyncEngine) -> dict:
+        pool = engine.pool
+        stats = {"pool": pool.__class__.__name__, "status": pool.status()}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+                saturation=round(
+                    pool.checkedout() / (pool.size() + max(settings.DB_MAX_OVERFLOW, 0)), 3
+                ),
+            )
+        if isinstance(pool, TimedQueuePool):
+            stats.update(
+                wait_count=pool.wait_count,
+                wait_avg_ms=pool.wait_total / pool.wait_count * 1000 if pool.wait_count else 0.0,
+                wait_max_ms=pool.wait_max * 1000,
+            )
+        return stats
+
+
+sessionmanager = DatabaseSessionManager(settings.DB_URL, settings.DB_REPLICA_URLS)
 
 async def get_db():
     async with sessionmanager.session() as session:
         yield session 
 
-
@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, func
-from sqlalchemy.orm import  DeclarativeBase, relationship
+from datetime import date
+
+from sqlalchemy import Column, Integer, String, Boolean, Index, JSON, UniqueConstraint, func
+from sqlalchemy.orm import  DeclarativeBase, relationship, validates
 from sqlalchemy.sql.sqltypes import Date, DateTime
 from sqlalchemy.sql.schema import ForeignKey
 
 class Base(DeclarativeBase):
     pass
 
+def birthday_ordinal(value: date) -> int:
+    # Day of year in a leap year, so 29 Feb is always 60 and 1 Mar always 61.
+    return date(2000, value.month, value.day).timetuple().tm_yday
+
 class Contact(Base):
     __tablename__ = "contacts"
 
@@ -15,12 +21,34 @@ class Contact(Base):
     email = Column(String, index=True, nullable=False)
     phone = Column(String, nullable=False)
     birth_date = Column(Date, nullable=False)
+    birthday_doy = Column(Integer, nullable=False)
     additional_info = Column(String, nullable=True)
     user_id = Column(
         "user_id", ForeignKey("users.id", ondelete="CASCADE"), default=None
     )
     user = relationship("User", backref="contacts")
 
+    __table_args__ = (
+        UniqueConstraint("user_id", "email", name="unique_contact_user"),
+        UniqueConstraint("user_id", "phone", name="unique_contact_user_phone"),
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_birthday_doy", "user_id", "birthday_doy"),
+        *(
+            Index(
+                f"ix_contacts_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("first_name", "last_name", "email")
+        ),
+    )
+
+    @validates("birth_date")
+    def _set_birthday_doy(self, key, value):
+        self.birthday_doy = birthday_ordinal(value) if value else None
+        return value
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True)
@@ -31,3 +59,36 @@ class User(Base):
     avatar = Column(String(255), nullable=True)
     confirmed = Column(Boolean, default=False)
 
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    id = Column(Integer, primary_key=True)
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    template = Column(String, nullable=False)
+    context = Column(JSON, nullable=True)
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+        Index("ix_email_outbox_created_at", "created_at"),
+    )
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    id = Column(String(32), primary_key=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    replaced_by = Column(String(32), nullable=True)
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+    id = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryLog:
+    __slots__ = ("statements", "shapes")
+
+    def __init__(self):
+        self.statements: list[tuple[str, float]] = []
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.statements.append((statement, elapsed))
+        if is_select(statement):
+            self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        # Statements are parameterised, so identical text means identical shape.
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+query_log: ContextVar[QueryLog | None] = ContextVar("query_log", default=None)
+
+
+def is_select(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so anything locking or writing is out.
+    return statement.lstrip()[:6].upper() == "SELECT" and "FOR UPDATE" not in statement.upper()
+
+
+class QueryProfiler:
+    def __init__(self, slow_ms: float, explain: bool):
+        self.slow_seconds = slow_ms / 1000
+        self.explain = explain
+        self._engines: dict[object, AsyncEngine] = {}
+        self._pending: set[asyncio.Task] = set()
+
+    def install(self, engines: list[AsyncEngine]):
+        for engine in engines:
+            self._engines[engine.sync_engine] = engine
+            event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+            event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._profile_start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._profile_start
+        if conn.info.get("profiling_explain"):
+            return
+        log = query_log.get()
+        if log is not None:
+            log.record(statement, elapsed)
+        if elapsed >= self.slow_seconds:
+            engine = self._engines.get(conn.engine)
+            if self.explain and engine is not None and is_select(statement):
+                self._schedule_explain(engine, statement, parameters, elapsed)
+            else:
+                logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement)
+
+    def _schedule_explain(self, engine: AsyncEngine, statement, parameters, elapsed: float):
+        # Runs on its own connection after the request's statement has returned.
+        task = asyncio.get_running_loop().create_task(self._explain(engine, statement, parameters, elapsed))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _explain(self, engine: AsyncEngine, statement: str, parameters, elapsed: float):
+        prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN ANALYZE "
+        try:
+            async with engine.connect() as conn:
+                conn.sync_connection.info["profiling_explain"] = True
+                try:
+                    result = await conn.exec_driver_sql(prefix + statement, parameters)
+                    plan = "\n".join(" ".join(str(value) for value in row) for row in result)
+                finally:
+                    await conn.rollback()
+                    conn.sync_connection.info.pop("profiling_explain", None)
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e!r}"
+        logger.warning("Slow query (%.1f ms): %s\nPlan:\n%s", elapsed * 1000, statement, plan)
+
+
+profiler = QueryProfiler(settings.DB_SLOW_QUERY_MS, settings.DB_EXPLAIN_SLOW_QUERIES)
+
+
+class QueryProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        log = QueryLog()
+        token = query_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            query_log.reset(token)
+            route = scope.get("route")
+            path = route.path if route is not None else scope["path"]
+            for statement, count in log.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+                logger.warning("Possible N+1 in %s %s: %dx %s", scope["method"], path, count, statement)
+
+
+def max_queries(budget: int):
+    async def dependency():
+        log = query_log.get()
+        if log is None:
+            yield
+            return
+        yield
+        if len(log.statements) > budget:
+            message = f"{len(log.statements)} queries exceed the budget of {budget}"
+            if settings.DB_QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    return dependency
@@ -1,103 +1,206 @@
 from typing import List, Optional
 from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from src.database.models import Contact, User
+from sqlalchemy import case, delete, func, insert, or_, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from src.database.models import Contact, User, birthday_ordinal
 from src.schemas import ContactCreate, ContactUpdate
-from sqlalchemy.sql import extract
+from src.repository.pagination import paginate
+from src.services.response_cache import response_cache
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 
+CONTACT_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone,
+    Contact.birth_date,
+    Contact.additional_info,
+)
+
 class ContactRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, orm_reads: bool = False):
         self.db = session
+        self.orm_reads = orm_reads
+
+    def _select(self):
+        # List reads return lightweight Row tuples of the response columns
+        # unless ORM entities are asked for; rows skip the identity map.
+        return select(Contact) if self.orm_reads else select(*CONTACT_COLUMNS)
 
-    async def get_contacts(self, skip: int, limit: int, user: User) -> List[Contact]:
-        stmt = select(Contact).where(Contact.user_id == user.id).offset(skip).limit(limit)
+    async def _fetch_all(self, stmt):
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return result.scalars().all() if self.orm_reads else result.all()
+
+    async def get_contacts(self, skip: int, limit: int, user: User, after_id: Optional[int] = None) -> List[Contact]:
+        stmt = paginate(self._select().where(Contact.user_id == user.id), skip, limit, after_id)
+        return await self._fetch_all(stmt)
+
+    async def stream_contacts(self, user: User, batch_size: int):
+        stmt = (
+            select(*CONTACT_COLUMNS)
+            .where(Contact.user_id == user.id)
+            .order_by(Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
 
     async def get_contact_by_id(self, contact_id: int, user: User) -> Optional[Contact]:
         stmt = select(Contact).where(Contact.id == contact_id, Contact.user_id == user.id)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_contacts_by_name(self, name: str, skip: int, limit: int, user: User) -> List[Contact]:
-        stmt = select(Contact).where(Contact.first_name.ilike(f"%{name}%"), Contact.user_id == user.id).offset(skip).limit(limit)
-        result = await self.db.execute(stmt)
-        return result.scalars().all()
+    async def get_contacts_by_name(self, name: str, skip: int, limit: int, user: User, after_id: Optional[int] = None) -> List[Contact]:
+        stmt = self._select().where(Contact.first_name.ilike(f"%{name}%"), Contact.user_id == user.id)
+        stmt = paginate(stmt, skip, limit, after_id)
+        return await self._fetch_all(stmt)
 
     async def create_contact(self, body: ContactCreate, user: User) -> Contact:
-        query = select(Contact).where((Contact.user_id == user.id) & ((Contact.email == body.email) | (Contact.phone == body.phone)))
-        result = await self.db.execute(query)
-        existing_contact = result.scalars().first()
-
-        if existing_contact:
-            raise HTTPException(
-                status_code=400,
-                detail="Ви вже маєте контакт із таким email або телефоном."
+        stmt = (
+            insert(Contact)
+            .values(
+                **body.model_dump(exclude_unset=True),
+                birthday_doy=birthday_ordinal(body.birth_date),
+                user_id=user.id,
             )
+            .returning(Contact)
+        )
+        try:
+            db_contact = (await self.db.execute(stmt)).scalar_one()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise _duplicate_contact()
+        await response_cache.bump(user.id)
+        return db_contact
 
-        db_contact = Contact(**body.model_dump(exclude_unset=True), user_id=user.id)
-        self.db.add(db_contact)
+    async def import_contacts(self, contacts: List[ContactCreate], user: User) -> List[bool]:
+        emails = {c.email for c in contacts}
+        phones = {c.phone for c in contacts}
+        stmt = select(Contact.email, Contact.phone).where(
+            Contact.user_id == user.id,
+            or_(Contact.email.in_(emails), Contact.phone.in_(phones)),
+        )
+        existing = (await self.db.execute(stmt)).all()
+        taken_emails = {row.email for row in existing}
+        taken_phones = {row.phone for row in existing}
 
-        await self.db.commit()
-        await self.db.refresh(db_contact)
-        return db_contact
+        rows = [
+            {
+                **c.model_dump(),
+                "birthday_doy": birthday_ordinal(c.birth_date),
+                "user_id": user.id,
+            }
+            for c in contacts
+            if c.email not in taken_emails and c.phone not in taken_phones
+        ]
+        inserted = set()
+        if rows:
+            stmt = _insert_ignore(self.db.get_bind().dialect.name).returning(Contact.email)
+            result = await self.db.execute(stmt, rows)
+            inserted = set(result.scalars().all())
+            await self.db.commit()
+            await response_cache.bump(user.id)
+        return [c.email in inserted for c in contacts]
 
     async def update_contact(self, contact_id: int, body: ContactUpdate, user: User) -> Optional[Contact]:
-        contact = await self.get_contact_by_id(contact_id, user)
-        if contact:
-            if body.first_name:
-                contact.first_name = body.first_name
-            if body.last_name:
-                contact.last_name = body.last_name
-            if body.email:
-                contact.email = body.email
-            if body.phone:
-                contact.phone = body.phone
-            if body.birth_date:
-                contact.birth_date = body.birth_date
-            if body.additional_info:
-                contact.additional_info = body.additional_info
+        values = {key: value for key, value in body.model_dump().items() if value}
+        if not values:
+            return await self.get_contact_by_id(contact_id, user)
+        if "birth_date" in values:
+            values["birthday_doy"] = birthday_ordinal(values["birth_date"])
+
+        stmt = (
+            update(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .values(**values)
+            .returning(Contact)
+        )
+        try:
+            contact = (await self.db.execute(stmt)).scalar_one_or_none()
             await self.db.commit()
-            await self.db.refresh(contact)
+        except IntegrityError:
+            await self.db.rollback()
+            raise _duplicate_contact()
+        if contact:
+            await response_cache.bump(user.id)
         return contact
 
     async def delete_contact(self, contact_id: int, user: User) -> Optional[Contact]:
-        contact = await self.get_contact_by_id(contact_id, user)
+        stmt = (
+            delete(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .returning(Contact)
+        )
+        contact = (await self.db.execute(stmt)).scalar_one_or_none()
+        await self.db.commit()
         if contact:
-            await self.db.delete(contact)
-            await self.db.commit()
+            await response_cache.bump(user.id)
         return contact
 
-    async def search_contacts(self, name: Optional[str], surname: Optional[str], email: Optional[str], user: User):
-        stmt = select(Contact).where(Contact.user_id == user.id)
+    async def search_contacts(self, name: Optional[str], surname: Optional[str], email: Optional[str], user: User, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+        stmt = self._select().where(Contact.user_id == user.id)
         if name:
             stmt = stmt.where(Contact.first_name.ilike(f"%{name}%"))
         if surname:
             stmt = stmt.where(Contact.last_name.ilike(f"%{surname}%"))
         if email:
             stmt = stmt.where(Contact.email.ilike(f"%{email}%"))
-        result = await self.db.execute(stmt)
-        contacts = result.scalars().all()        
-        return contacts
+        stmt = paginate(stmt, skip, limit, after_id)
+        return await self._fetch_all(stmt)
     
-    async def get_upcoming_birthdays(self, today: date, next_week: date, user: User):
-        stmt = select(Contact).where(
-            (Contact.user_id == user.id) &
-            (
-                (
-                    (extract('month', Contact.birth_date) == today.month) &
-                    (extract('day', Contact.birth_date) >= today.day)
-                ) |
-                (
-                    (extract('month', Contact.birth_date) == next_week.month) &
-                    (extract('day', Contact.birth_date) <= next_week.day)
-                )
+    async def search(self, q: str, user: User, skip: int = 0, limit: int = 100) -> List[Contact]:
+        pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        stmt = self._select().where(
+            Contact.user_id == user.id,
+            or_(
+                Contact.first_name.ilike(pattern, escape="\\"),
+                Contact.last_name.ilike(pattern, escape="\\"),
+                Contact.email.ilike(pattern, escape="\\"),
+            ),
+        )
+        if self.db.get_bind().dialect.name == "postgresql":
+            rank = func.greatest(
+                func.similarity(Contact.first_name, q),
+                func.similarity(Contact.last_name, q),
+                func.similarity(Contact.email, q),
             )
+            stmt = stmt.order_by(rank.desc(), Contact.id)
+        else:
+            stmt = stmt.order_by(Contact.id)
+        return await self._fetch_all(stmt.offset(skip).limit(limit))
+
+    async def get_upcoming_birthdays(self, today: date, until: date, user: User):
+        start = birthday_ordinal(today)
+        stop = birthday_ordinal(until)
+        if (until - today).days >= 365:
+            window = true()
+        elif stop >= start:
+            window = Contact.birthday_doy.between(start, stop)
+        else:
+            window = (Contact.birthday_doy >= start) | (Contact.birthday_doy <= stop)
+
+        days_left = case(
+            (Contact.birthday_doy >= start, Contact.birthday_doy - start),
+            else_=Contact.birthday_doy + 366 - start,
         )
+        stmt = self._select().where(Contact.user_id == user.id, window).order_by(days_left, Contact.id)
 
-        result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return await self._fetch_all(stmt)
+
+def _duplicate_contact() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail="Ви вже маєте контакт із таким email або телефоном."
+    )
 
+def _insert_ignore(dialect: str):
+    if dialect == "postgresql":
+        return postgresql.insert(Contact).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(Contact).on_conflict_do_nothing()
+    return insert(Contact)
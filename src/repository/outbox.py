@@ -0,0 +1,91 @@
+from datetime import datetime, UTC, timedelta
+from typing import List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import EmailOutbox
+
+
+def utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class OutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.db = session
+
+    async def enqueue(self, recipient: str, subject: str, template: str, context: dict, commit: bool = False) -> EmailOutbox:
+        now = utcnow()
+        message = EmailOutbox(
+            recipient=recipient,
+            subject=subject,
+            template=template,
+            context=context,
+            status="pending",
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        )
+        self.db.add(message)
+        if commit:
+            await self.db.commit()
+        return message
+
+    async def claim_batch(self, limit: int, lease_seconds: float) -> List[EmailOutbox]:
+        # A claimed row is "sending" until its lease (next_attempt_at) runs out;
+        # if the dispatcher dies mid-batch the row becomes claimable again.
+        now = utcnow()
+        stmt = (
+            select(EmailOutbox)
+            .where(EmailOutbox.status.in_(("pending", "sending")), EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        messages = (await self.db.execute(stmt)).scalars().all()
+        for message in messages:
+            message.status = "sending"
+            message.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        await self.db.commit()
+        return messages
+
+    async def save(self, messages: List[EmailOutbox]) -> None:
+        self.db.add_all(messages)
+        await self.db.commit()
+
+    @staticmethod
+    def mark_sent(message: EmailOutbox) -> None:
+        message.status = "sent"
+        message.attempts += 1
+        message.sent_at = utcnow()
+        message.last_error = None
+        # The context carries the verification token; a sent mail has no use for it.
+        message.context = None
+
+    @staticmethod
+    def mark_failed(message: EmailOutbox, error: str, retry_in: float | None) -> None:
+        message.attempts += 1
+        message.last_error = error[:1000]
+        if retry_in is None:
+            message.status = "failed"
+            message.context = None
+        else:
+            message.status = "pending"
+            message.next_attempt_at = utcnow() + timedelta(seconds=retry_in)
+
+    async def pending_count(self) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(EmailOutbox)
+            .where(EmailOutbox.status.in_(("pending", "sending")))
+        )
+        return await self.db.scalar(stmt)
+
+    async def purge(self, older_than: datetime) -> int:
+        stmt = delete(EmailOutbox).where(
+            EmailOutbox.status.in_(("sent", "failed")), EmailOutbox.created_at < older_than
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount
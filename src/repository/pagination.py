@@ -0,0 +1,40 @@
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select
+
+from src.database.models import Contact
+
+
+def encode_cursor(contact_id: int) -> str:
+    raw = json.dumps({"id": contact_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Некоректний курсор"
+        )
+
+
+def paginate(stmt: Select, skip: int, limit: int, after_id: Optional[int] = None) -> Select:
+    stmt = stmt.order_by(Contact.id)
+    if after_id is not None:
+        stmt = stmt.where(Contact.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+def next_cursor(contacts, limit: int) -> Optional[str]:
+    if not contacts or len(contacts) < limit:
+        return None
+    return encode_cursor(contacts[-1].id)
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import RefreshToken, TokenRevocation
+from src.repository.outbox import utcnow
+
+
+class TokenRepository:
+    def __init__(self, session: AsyncSession):
+        self.db = session
+
+    async def create_refresh_token(
+        self, jti: str, family_id: str, user_id: int, expires_at: datetime
+    ) -> RefreshToken:
+        token = RefreshToken(
+            id=jti,
+            family_id=family_id,
+            user_id=user_id,
+            created_at=utcnow(),
+            expires_at=expires_at,
+        )
+        self.db.add(token)
+        await self.db.commit()
+        return token
+
+    async def get_refresh_token(self, jti: str) -> RefreshToken | None:
+        stmt = select(RefreshToken).filter_by(id=jti).with_for_update()
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def rotate_refresh_token(
+        self, token: RefreshToken, jti: str, expires_at: datetime
+    ) -> RefreshToken:
+        now = utcnow()
+        token.revoked_at = now
+        token.replaced_by = jti
+        successor = RefreshToken(
+            id=jti,
+            family_id=token.family_id,
+            user_id=token.user_id,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        self.db.add(successor)
+        await self.db.commit()
+        return successor
+
+    async def revoke_family(self, family_id: str, expires_at: datetime) -> None:
+        await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=utcnow())
+        )
+        if await self.db.get(TokenRevocation, family_id) is None:
+            self.db.add(TokenRevocation(id=family_id, expires_at=expires_at))
+        await self.db.commit()
+
+    async def is_revoked(self, revoked_id: str, primary: bool = False) -> bool:
+        stmt = select(TokenRevocation.id).where(
+            TokenRevocation.id == revoked_id, TokenRevocation.expires_at > utcnow()
+        )
+        if primary:
+            stmt = stmt.execution_options(use_primary=True)
+        return await self.db.scalar(stmt) is not None
+
+    async def active_revocations(self) -> List[str]:
+        stmt = select(TokenRevocation.id).where(TokenRevocation.expires_at > utcnow())
+        return list(await self.db.scalars(stmt))
+
+    async def purge_revocations(self) -> None:
+        await self.db.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= utcnow()))
+        await self.db.commit()
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
 from src.schemas import UserCreate
+from src.services.cache import user_cache
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
@@ -38,10 +39,17 @@ class UserRepository:
         user = await self.get_user_by_email(email)
         user.confirmed = True
         await self.db.commit()
+        await user_cache.delete(user.username)
+
+    async def update_password(self, email: str, hashed_password: str) -> None:
+        user = await self.get_user_by_email(email)
+        user.hashed_password = hashed_password
+        await self.db.commit()
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         user = await self.get_user_by_email(email)
         user.avatar = url
         await self.db.commit()
         await self.db.refresh(user)
+        await user_cache.delete(user.username)
         return user
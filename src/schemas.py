@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 class ContactBase(BaseModel):
     first_name: str
@@ -24,13 +24,24 @@ class ContactUpdate(ContactBase):
 class Contact(ContactBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ContactResponse(Contact):
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class ContactImportError(BaseModel):
+    row: int
+    detail: str
+
+class ContactImportReport(BaseModel):
+    total: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[ContactImportError] = []
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
 
 class User(BaseModel):
     id: int
@@ -48,6 +59,10 @@ class UserCreate(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 class RequestEmail(BaseModel):
     email: EmailStr
\ No newline at end of file
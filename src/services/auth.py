@@ -2,36 +2,49 @@ from datetime import datetime, timedelta, UTC
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from jose import JWTError
 
-from src.database.db import get_db
+from src.database.db import get_db, route_key
+from src.database.models import User
 from src.conf.config import settings
+from src.services.cache import user_cache
+from src.services.metrics import timed
+from src.services.revocation import revocation_list
+from src.services.tokens import token_service
+from src.services import hashing
 from src.services.users import UserService
 
 class Hash:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    async def verify_and_update_async(self, plain_password, hashed_password):
+        with timed("bcrypt_verify"):
+            return await hashing.hashing_pool.run(
+                hashing.verify_and_update, plain_password, hashed_password
+            )
 
-    def verify_password(self, plain_password, hashed_password):
-        return self.pwd_context.verify(plain_password, hashed_password)
-
-    def get_password_hash(self, password: str):
-        return self.pwd_context.hash(password)
+    async def get_password_hash_async(self, password: str) -> str:
+        with timed("bcrypt_hash"):
+            return await hashing.hashing_pool.run(hashing.hash_password, password)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-async def create_access_token(data: dict, expires_delta: Optional[int] = None):
+def create_access_token(data: dict, expires_delta: Optional[int] = None):
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(UTC) + timedelta(seconds=expires_delta)
     else:
         expire = datetime.now(UTC) + timedelta(seconds=settings.JWT_EXPIRATION_SECONDS)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
-    )
+    with timed("jwt_encode"):
+        encoded_jwt = token_service.encode(to_encode)
+    return encoded_jwt
+
+def create_refresh_token(data: dict, expires_at: datetime):
+    to_encode = data.copy()
+    to_encode.update({"exp": expires_at, "typ": "refresh"})
+    with timed("jwt_encode"):
+        encoded_jwt = token_service.encode(to_encode)
     return encoded_jwt
 
 async def get_current_user(
@@ -44,32 +57,47 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
+        with timed("jwt_decode"):
+            payload = await token_service.decode(token)
         username = payload["sub"]
-        if username is None:
+        if username is None or payload.get("typ") == "refresh":
             raise credentials_exception
     except JWTError as e:
         raise credentials_exception
+    if await revocation_list.is_revoked(db, payload.get("fam")):
+        raise credentials_exception
+    route_key.set(username)
+
+    cached = await user_cache.get(username)
+    if cached is not None:
+        return User(**cached)
+
     user_service = UserService(db)
     user = await user_service.get_user_by_username(username)
     if user is None:
         raise credentials_exception
+    await user_cache.set(username, _user_to_cache(user))
     return user
 
+def _user_to_cache(user: User) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "avatar": user.avatar,
+        "confirmed": user.confirmed,
+    }
+
 def create_email_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(UTC) + timedelta(days=7)
     to_encode.update({"iat": datetime.now(UTC), "exp": expire})
-    token = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    token = token_service.encode(to_encode)
     return token
 
 async def get_email_from_token(token: str):
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = await token_service.decode(token)
         email = payload["sub"]
         return email
     except JWTError as e:
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.repository.contacts import ContactRepository
 from src.schemas import ContactCreate, ContactUpdate
-from typing import List
+from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from src.database.models import User
@@ -29,14 +29,14 @@ class ContactService:
             await self.repository.db.rollback()
             _handle_integrity_error(e)
 
-    async def get_contacts(self, skip: int, limit: int, user: User) -> List:
-        return await self.repository.get_contacts(skip, limit, user)
+    async def get_contacts(self, skip: int, limit: int, user: User, after_id: Optional[int] = None) -> List:
+        return await self.repository.get_contacts(skip, limit, user, after_id)
 
     async def get_contact_by_id(self, contact_id: int, user: User):
         return await self.repository.get_contact_by_id(contact_id, user)
 
-    async def get_contacts_by_name(self, name: str, skip: int, limit: int, user: User) -> List:
-        return await self.repository.get_contacts_by_name(name, skip, limit, user)
+    async def get_contacts_by_name(self, name: str, skip: int, limit: int, user: User, after_id: Optional[int] = None) -> List:
+        return await self.repository.get_contacts_by_name(name, skip, limit, user, after_id)
 
     async def update_contact(self, contact_id: int, contact_data: ContactUpdate, user: User):
         try:
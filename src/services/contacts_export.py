@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.database.models import User
+from src.repository.contacts import CONTACT_COLUMNS, ContactRepository
+
+EXPORT_FIELDS = [column.key for column in CONTACT_COLUMNS]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _encode_ndjson(rows) -> str:
+    return "".join(json.dumps(row._asdict(), default=str, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def export_contacts(user: User, fmt: str) -> AsyncIterator[bytes]:
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    if fmt == "csv":
+        yield _encode_csv([EXPORT_FIELDS]).encode()
+    async with sessionmanager.session() as db:
+        repo = ContactRepository(db)
+        async for rows in repo.stream_contacts(user, settings.CONTACTS_EXPORT_BATCH_SIZE):
+            yield encode(rows).encode()
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
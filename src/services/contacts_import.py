@@ -0,0 +1,131 @@
+import codecs
+import csv
+import io
+import json
+import time
+from typing import AsyncIterator, List, Optional
+
+from pydantic import ValidationError
+
+from src.conf.config import settings
+from src.database.models import User
+from src.repository.contacts import ContactRepository
+from src.schemas import ContactCreate, ContactImportError, ContactImportReport
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # A quoted field may span lines (csv.writer keeps embedded newlines), so
+    # lines are joined until the quotes balance; "" escapes keep the count even.
+    pending: list[str] = []
+    quotes = 0
+    async for line in iter_lines(chunks):
+        if not pending and not line.strip():
+            continue
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield "\n".join(pending)
+            pending, quotes = [], 0
+    if pending:
+        yield "\n".join(pending)
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str):
+    header: Optional[List[str]] = None
+    row = 0
+    records = iter_csv_records(chunks) if fmt == "csv" else iter_lines(chunks)
+    async for record in records:
+        if not record.strip():
+            continue
+        if fmt == "csv" and header is None:
+            header = [name.strip() for name in next(csv.reader(io.StringIO(record)))]
+            continue
+        row += 1
+        try:
+            if fmt == "csv":
+                values = next(csv.reader(io.StringIO(record)))
+                yield row, {k: v for k, v in zip(header, values) if v != ""}
+            else:
+                yield row, json.loads(record)
+        except (csv.Error, json.JSONDecodeError) as e:
+            yield row, e
+
+
+class ContactImporter:
+    def __init__(self, repository: ContactRepository, user: User):
+        self.repository = repository
+        self.user = user
+        self.chunk_size = settings.CONTACTS_IMPORT_CHUNK_SIZE
+        self.seen_emails: set[str] = set()
+        self.seen_phones: set[str] = set()
+        self.report = ContactImportReport()
+
+    async def run(self, chunks: AsyncIterator[bytes], fmt: str) -> ContactImportReport:
+        start = time.perf_counter()
+        batch: list[tuple[int, ContactCreate]] = []
+        async for row, record in iter_records(chunks, fmt):
+            self.report.total += 1
+            contact = self._validate(row, record)
+            if contact is None:
+                continue
+            batch.append((row, contact))
+            if len(batch) >= self.chunk_size:
+                await self._flush(batch)
+                batch = []
+        if batch:
+            await self._flush(batch)
+        # Database duplicates are only known at flush time, after later rows'
+        # parse errors; report everything in file order.
+        self.report.errors.sort(key=lambda error: error.row)
+
+        elapsed = time.perf_counter() - start
+        self.report.elapsed_seconds = round(elapsed, 3)
+        self.report.rows_per_second = round(self.report.total / elapsed, 1) if elapsed else 0.0
+        return self.report
+
+    def _validate(self, row: int, record) -> Optional[ContactCreate]:
+        if isinstance(record, Exception):
+            self._error(row, f"Не вдалося розібрати рядок: {record}")
+            return None
+        try:
+            contact = ContactCreate.model_validate(record)
+        except ValidationError as e:
+            self._error(row, "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            ))
+            return None
+        if contact.email in self.seen_emails or contact.phone in self.seen_phones:
+            self._duplicate(row, "Дублікат email або телефону у файлі")
+            return None
+        self.seen_emails.add(contact.email)
+        self.seen_phones.add(contact.phone)
+        return contact
+
+    async def _flush(self, batch: list[tuple[int, ContactCreate]]) -> None:
+        inserted = await self.repository.import_contacts([c for _, c in batch], self.user)
+        for (row, _), ok in zip(batch, inserted):
+            if ok:
+                self.report.imported += 1
+            else:
+                self._duplicate(row, "Ви вже маєте контакт із таким email або телефоном.")
+
+    def _error(self, row: int, detail: str) -> None:
+        self.report.failed += 1
+        self.report.errors.append(ContactImportError(row=row, detail=detail))
+
+    def _duplicate(self, row: int, detail: str) -> None:
+        self.report.duplicates += 1
+        self.report.errors.append(ContactImportError(row=row, detail=detail))
@@ -1,41 +1,49 @@
-from pathlib import Path
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import List
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
 from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.database.models import EmailOutbox
+from src.repository.outbox import OutboxRepository
 from src.services.auth import create_email_token
+from src.services.mail_templates import template_registry
 from src.conf.config import settings
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=settings.VALIDATE_CERTS,
-    TEMPLATE_FOLDER=Path(__file__).parent / "templates",
-)
+async def enqueue_verification_email(
+    db: AsyncSession, email: EmailStr, username: str, host: str, commit: bool = False
+):
+    token_verification = create_email_token({"sub": email})
+    await OutboxRepository(db).enqueue(
+        recipient=email,
+        subject="Confirm your email",
+        template="verify_email.html",
+        context={
+            "host": str(host),
+            "username": username,
+            "token": token_verification,
+        },
+        commit=commit,
+    )
 
-async def send_email(email: EmailStr, username: str, host: str):
-    try:
-        token_verification = create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Confirm your email",
-            recipients=[email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token_verification,
-            },
-            subtype=MessageType.html,
-        )
+def build_messages(messages: List[EmailOutbox]) -> List[EmailMessage]:
+    by_template: dict[str, list[EmailOutbox]] = {}
+    for message in messages:
+        by_template.setdefault(message.template, []).append(message)
 
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="verify_email.html")
-    except ConnectionErrors as err:
-        print(err)
+    bodies = {}
+    for name, group in by_template.items():
+        rendered = template_registry.render_many(name, [m.context for m in group])
+        bodies.update(zip((m.id for m in group), rendered))
+    return [build_message(message, bodies[message.id]) for message in messages]
+
+def build_message(message: EmailOutbox, html: str | None = None) -> EmailMessage:
+    if html is None:
+        html = template_registry.render(message.template, message.context)
+    mail = EmailMessage()
+    mail["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    mail["To"] = message.recipient
+    mail["Subject"] = message.subject
+    mail.set_content(html, subtype="html")
+    return mail
@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import time
+from functools import partial
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.services.mail_dispatcher import mail_dispatcher
+from src.services.storage import avatar_storage
+
+
+async def check_engine(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+class HealthMonitor:
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self._checks: dict[str, tuple[Callable[[], Awaitable], bool, float]] = {}
+        self._due: dict[str, float] = {}
+        self.results: dict[str, dict] = {}
+        self.checked_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def register(
+        self,
+        name: str,
+        check: Callable[[], Awaitable],
+        critical: bool = False,
+        interval: float | None = None,
+    ):
+        self._checks[name] = (check, critical, interval or self.interval)
+
+    async def run_checks(self):
+        now = time.monotonic()
+        due = [name for name in self._checks if self._due.get(name, 0) <= now]
+        for name, result in await asyncio.gather(*(self._run(name) for name in due)):
+            self.results[name] = result
+            self._due[name] = now + self._checks[name][2]
+        self.checked_at = time.monotonic()
+
+    async def _run(self, name: str) -> tuple[str, dict]:
+        check, critical, _ = self._checks[name]
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+            result = {"status": "ok"}
+        except Exception as e:
+            result = {"status": "error", "error": str(e) or e.__class__.__name__}
+        result.update(
+            critical=critical,
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+            checked_at=time.time(),
+        )
+        return name, result
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_checks()
+            except Exception as e:
+                print(e)
+
+    def is_stale(self) -> bool:
+        # A monitor that stopped running must not keep reporting "ok".
+        return self.checked_at is None or time.monotonic() - self.checked_at > 3 * self.interval
+
+    def healthy(self) -> bool:
+        if self.is_stale():
+            return False
+        return all(
+            self.results.get(name, {}).get("status") == "ok"
+            for name, (_, critical, _) in self._checks.items()
+            if critical
+        )
+
+    def snapshot(self) -> dict:
+        if not self.healthy():
+            overall = "error"
+        elif any(result["status"] != "ok" for result in self.results.values()):
+            overall = "degraded"
+        else:
+            overall = "ok"
+        return {
+            "status": overall,
+            "age_seconds": None if self.checked_at is None else round(time.monotonic() - self.checked_at, 3),
+            "checks": self.results,
+        }
+
+
+def build_monitor() -> HealthMonitor:
+    monitor = HealthMonitor(settings.HEALTH_CHECK_INTERVAL_SECONDS, settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    primary, *replicas = sessionmanager.engines()
+    monitor.register("database", partial(check_engine, primary), critical=True)
+    for index, engine in enumerate(replicas):
+        monitor.register(f"replica_{index}", partial(check_engine, engine))
+    if settings.MAIL_DISPATCHER_ENABLED:
+        monitor.register("mail", mail_dispatcher.pool.ping)
+    # The Cloudinary ping goes through its rate-limited Admin API.
+    monitor.register("storage", avatar_storage.check, interval=settings.HEALTH_STORAGE_CHECK_INTERVAL_SECONDS)
+    return monitor
+
+
+health_monitor = build_monitor()
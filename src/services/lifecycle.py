@@ -0,0 +1,39 @@
+import asyncio
+import signal
+
+
+class Lifecycle:
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+
+    def mark_ready(self):
+        self.ready = True
+
+    def install_drain_handler(self, drain_seconds: float):
+        # uvicorn has installed its own SIGTERM handler by the time the lifespan
+        # starts. Chain in front of it: flip readiness to 503 first, and only
+        # let uvicorn stop accepting connections drain_seconds later, so load
+        # balancers can take this instance out of rotation in between.
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(signal.SIGTERM)
+        if not callable(previous):
+            return
+
+        def handle_sigterm(signum, frame):
+            if self.draining:
+                # A second SIGTERM skips the rest of the drain period.
+                previous(signum, frame)
+                return
+            self.draining = True
+            print(f"SIGTERM received, draining for {drain_seconds}s")
+            loop.call_soon_threadsafe(loop.call_later, drain_seconds, previous, signum, frame)
+
+        try:
+            signal.signal(signal.SIGTERM, handle_sigterm)
+        except ValueError:
+            # Not the main thread (e.g. under a test client): nothing to chain.
+            return
+
+
+lifecycle = Lifecycle()
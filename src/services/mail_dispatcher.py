@@ -0,0 +1,216 @@
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import timedelta
+
+import aiosmtplib
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.outbox import OutboxRepository, utcnow
+from src.services.email import build_message, build_messages
+from src.services.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+class SMTPPool:
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: list[aiosmtplib.SMTP] = []
+        self._semaphore = asyncio.Semaphore(size)
+        self.connects = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=settings.MAIL_SSL_TLS,
+            start_tls=settings.MAIL_STARTTLS,
+            validate_certs=settings.VALIDATE_CERTS,
+            timeout=settings.MAIL_TIMEOUT_SECONDS,
+        )
+        try:
+            await client.connect()
+            if settings.USE_CREDENTIALS:
+                await client.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        except BaseException:
+            client.close()
+            raise
+        return client
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        async with self._semaphore:
+            client = None
+            while self._idle and client is None:
+                candidate = self._idle.pop()
+                if candidate.is_connected:
+                    client = candidate
+            if client is None:
+                client = await self._connect()
+                self.connects += 1
+            try:
+                yield client
+            except BaseException:
+                # Errors and cancellation can leave a command half-sent, so the
+                # client is never handed to the next sender.
+                client.close()
+                raise
+            self._idle.append(client)
+
+    async def ping(self):
+        # A dedicated connection: a health check never waits behind a busy
+        # pool or takes a slot from the senders.
+        client = await self._connect()
+        try:
+            await client.noop()
+        except BaseException:
+            client.close()
+            raise
+        with contextlib.suppress(aiosmtplib.SMTPException, OSError):
+            await client.quit()
+
+    async def close(self):
+        while self._idle:
+            client = self._idle.pop()
+            with contextlib.suppress(aiosmtplib.SMTPException, OSError):
+                await client.quit()
+
+
+class MailDispatcher:
+    PURGE_INTERVAL_SECONDS = 3600
+
+    def __init__(self):
+        self.pool = SMTPPool(settings.MAIL_SMTP_POOL_SIZE)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.queue_depth = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.send_seconds = 0.0
+        self.delivery_seconds = 0.0
+        self.max_delivery_seconds = 0.0
+        self.purged = 0
+        self._purged_at: float | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.pool.close()
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.dispatch_batch()
+            except Exception:
+                logger.exception("Mail dispatch batch failed")
+                processed = 0
+            try:
+                await self.purge()
+            except Exception:
+                logger.exception("Mail outbox purge failed")
+            if processed < settings.MAIL_BATCH_SIZE:
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), settings.MAIL_POLL_INTERVAL_SECONDS)
+
+    async def dispatch_batch(self) -> int:
+        # Claiming commits a lease on the rows, so no transaction, row lock or
+        # pooled connection is held while the SMTP server is being talked to.
+        # The outcomes are written back in a second short transaction.
+        async with sessionmanager.session() as db:
+            messages = await OutboxRepository(db).claim_batch(
+                settings.MAIL_BATCH_SIZE, settings.MAIL_LEASE_SECONDS
+            )
+        if messages:
+            with timed("email_render"):
+                mails = self._build(messages)
+            await asyncio.gather(*(self._deliver(message, mail) for message, mail in mails))
+        async with sessionmanager.session() as db:
+            repo = OutboxRepository(db)
+            if messages:
+                await repo.save(messages)
+            self.queue_depth = await repo.pending_count()
+        return len(messages)
+
+    async def purge(self):
+        now = time.monotonic()
+        if self._purged_at is not None and now - self._purged_at < self.PURGE_INTERVAL_SECONDS:
+            return
+        self._purged_at = now
+        older_than = utcnow() - timedelta(days=settings.MAIL_OUTBOX_RETENTION_DAYS)
+        async with sessionmanager.session() as db:
+            self.purged += await OutboxRepository(db).purge(older_than)
+
+    def _build(self, messages) -> list:
+        try:
+            return list(zip(messages, build_messages(messages)))
+        except Exception:
+            pass
+        # Something in the batch does not render; build one by one so a single
+        # bad row is retried and eventually failed without holding up the rest.
+        mails = []
+        for message in messages:
+            try:
+                mails.append((message, build_message(message)))
+            except Exception as e:
+                logger.warning("Cannot build email %s: %r", message.id, e)
+                self._fail(message, repr(e))
+        return mails
+
+    def _fail(self, message, error: str):
+        if message.attempts + 1 >= settings.MAIL_MAX_ATTEMPTS:
+            self.failed += 1
+            OutboxRepository.mark_failed(message, error, None)
+        else:
+            self.retried += 1
+            backoff = settings.MAIL_RETRY_BASE_SECONDS * 2 ** message.attempts
+            OutboxRepository.mark_failed(message, error, min(backoff, settings.MAIL_RETRY_MAX_SECONDS))
+
+    async def _deliver(self, message, mail):
+        start = time.perf_counter()
+        try:
+            async with self.pool.connection() as client:
+                with timed("email_send"):
+                    await client.send_message(mail)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            self._fail(message, str(e))
+            return
+        except Exception as e:
+            logger.exception("Cannot send email %s", message.id)
+            self._fail(message, repr(e))
+            return
+        self.send_seconds += time.perf_counter() - start
+        delivery = (utcnow() - message.created_at).total_seconds()
+        self.delivery_seconds += delivery
+        self.max_delivery_seconds = max(self.max_delivery_seconds, delivery)
+        self.sent += 1
+        OutboxRepository.mark_sent(message)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "smtp_connects": self.pool.connects,
+            "avg_send_ms": self.send_seconds / self.sent * 1000 if self.sent else 0.0,
+            "avg_delivery_seconds": self.delivery_seconds / self.sent if self.sent else 0.0,
+            "max_delivery_seconds": self.max_delivery_seconds,
+            "purged": self.purged,
+        }
+
+
+mail_dispatcher = MailDispatcher()
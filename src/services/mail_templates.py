@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Iterable
+
+from jinja2 import Environment, FileSystemLoader, Template, nodes, select_autoescape
+from markupsafe import escape
+
+TEMPLATE_FOLDER = Path(__file__).parent / "templates"
+
+
+class TemplateRegistry:
+    def __init__(self, folder: Path):
+        self.env = Environment(
+            loader=FileSystemLoader(folder),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+        self._templates: dict[str, Template] = {}
+        self._segments: dict[str, tuple[list[str], list[str]] | None] = {}
+
+    def load(self) -> None:
+        for name in self.env.list_templates():
+            self._compile(name)
+
+    def _compile(self, name: str) -> Template:
+        template = self.env.get_template(name)
+        self._templates[name] = template
+        self._segments[name] = self._split(name, template)
+        return template
+
+    def _split(self, name: str, template: Template):
+        # Templates that are nothing but static HTML and bare {{ variable }}
+        # outputs are cached as static segments, and later renders only splice
+        # escaped values in. Anything else (tags, filters, attribute access)
+        # goes through template.render.
+        source = self.env.loader.get_source(self.env, name)[0]
+        static, order = [""], []
+        for node in self.env.parse(source).body:
+            if not isinstance(node, nodes.Output):
+                return None
+            for child in node.nodes:
+                if isinstance(child, nodes.TemplateData):
+                    static[-1] += child.data
+                elif isinstance(child, nodes.Name) and child.ctx == "load":
+                    order.append(child.name)
+                    static.append("")
+                else:
+                    return None
+        return static, order
+
+    def get(self, name: str) -> Template:
+        return self._templates.get(name) or self._compile(name)
+
+    def render(self, name: str, context: dict) -> str:
+        return self.render_many(name, [context])[0]
+
+    def render_many(self, name: str, contexts: Iterable[dict]) -> list[str]:
+        template = self.get(name)
+        segments = self._segments.get(name)
+        if segments is None:
+            return [template.render(context) for context in contexts]
+
+        static, order = segments
+        quote = escape if template.environment.autoescape(name) else str
+        rendered = []
+        for context in contexts:
+            parts = [static[0]]
+            for variable, tail in zip(order, static[1:]):
+                parts.append(quote(context.get(variable, "")))
+                parts.append(tail)
+            rendered.append("".join(parts))
+        return rendered
+
+
+template_registry = TemplateRegistry(TEMPLATE_FOLDER)
@@ -0,0 +1,132 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.conf.config import settings
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+)
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed")
+DB_SECONDS = Counter("db_statement_seconds_total", "Time spent executing SQL statements")
+OPERATION_LATENCY = Histogram(
+    "operation_duration_seconds",
+    "Latency of expensive operations (bcrypt, JWT, email)",
+    ["operation"],
+)
+
+
+class RequestTimings:
+    __slots__ = ("db_count", "db_seconds", "operations")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_seconds = 0.0
+        self.operations: dict[str, float] = {}
+
+    def server_timing(self, total: float) -> str:
+        parts = [
+            f"app;dur={total * 1000:.2f}",
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_count} queries"',
+        ]
+        parts.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.operations.items())
+        return ", ".join(parts)
+
+
+request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(operation: str):
+    if not settings.METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        OPERATION_LATENCY.labels(operation).observe(elapsed)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.operations[operation] = timings.operations.get(operation, 0.0) + elapsed
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    DB_STATEMENTS.inc()
+    DB_SECONDS.inc(elapsed)
+    timings = request_timings.get()
+    if timings is not None:
+        timings.db_count += 1
+        timings.db_seconds += elapsed
+
+
+def install_db_hooks():
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                header = timings.server_timing(time.perf_counter() - start)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timings.reset(token)
+            # Label by route template, not raw path, to keep cardinality bounded.
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+            REQUEST_DB_STATEMENTS.labels(path).observe(timings.db_count)
+
+
+def metrics_payload() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
@@ -0,0 +1,77 @@
+import math
+import time
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from limits import parse
+from limits.storage import storage_from_string
+from limits.aio import strategies
+
+from src.conf.config import settings
+from src.schemas import User
+from src.services.auth import get_current_user
+
+STRATEGIES = {
+    "sliding-window": strategies.SlidingWindowCounterRateLimiter,
+    "moving-window": strategies.MovingWindowRateLimiter,
+    "fixed-window": strategies.FixedWindowRateLimiter,
+}
+
+
+def build_limiter(url: str, strategy: str) -> strategies.RateLimiter:
+    # redis-py is already a dependency, so use it instead of limits' default coredis.
+    options = {"implementation": "redispy"} if "redis" in url.split("://")[0] else {}
+    return STRATEGIES[strategy](storage_from_string(url, **options))
+
+
+limiter = build_limiter(settings.RATE_LIMIT_STORAGE_URL, settings.RATE_LIMIT_STRATEGY)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    def __init__(self, name: str, limit: str):
+        self.name = name
+        self.item = parse(limit)
+
+    async def hit(self, *keys: str) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        for key in keys:
+            try:
+                allowed = await limiter.hit(self.item, self.name, key)
+                if allowed:
+                    continue
+                stats = await limiter.get_window_stats(self.item, self.name, key)
+            except Exception as e:
+                # The limiter's storage being down must not take the API with it.
+                print(e)
+                return
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Перевищено ліміт запитів. Спробуйте пізніше.",
+                headers={"Retry-After": str(max(1, math.ceil(stats.reset_time - time.time())))},
+            )
+
+    async def __call__(self, request: Request):
+        await self.hit(f"ip:{client_ip(request)}")
+
+
+class UserRateLimit(RateLimit):
+    async def __call__(self, request: Request, user: User = Depends(get_current_user)):
+        await self.hit(f"user:{user.id}", f"ip:{client_ip(request)}")
+
+
+class LoginRateLimit(RateLimit):
+    async def __call__(
+        self, request: Request, form_data: OAuth2PasswordRequestForm = Depends()
+    ):
+        await self.hit(f"ip:{client_ip(request)}", f"username:{form_data.username.lower()}")
+
+
+me_limit = UserRateLimit("me", settings.RATE_LIMIT_ME)
+login_limit = LoginRateLimit("login", settings.RATE_LIMIT_LOGIN)
+refresh_limit = RateLimit("refresh", settings.RATE_LIMIT_REFRESH)
+search_limit = UserRateLimit("search", settings.RATE_LIMIT_SEARCH)
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.models import User
+from src.repository.outbox import utcnow
+from src.repository.tokens import TokenRepository
+from src.services.auth import create_access_token, create_refresh_token
+from src.services.revocation import revocation_list
+from src.services.tokens import token_service
+
+
+def invalid_refresh_token():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Недійсний refresh-токен",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def new_refresh_id() -> tuple[str, datetime]:
+    return uuid4().hex, utcnow() + timedelta(seconds=settings.JWT_REFRESH_EXPIRATION_SECONDS)
+
+
+def token_pair(username: str, family_id: str, jti: str, expires_at: datetime) -> dict:
+    return {
+        "access_token": create_access_token(data={"sub": username, "fam": family_id}),
+        "refresh_token": create_refresh_token(
+            {"sub": username, "fam": family_id, "jti": jti}, expires_at
+        ),
+        "token_type": "bearer",
+    }
+
+
+class RefreshTokenService:
+    def __init__(self, db: AsyncSession):
+        self.repository = TokenRepository(db)
+
+    async def issue_tokens(self, user: User) -> dict:
+        family_id = uuid4().hex
+        jti, expires_at = new_refresh_id()
+        await self.repository.create_refresh_token(jti, family_id, user.id, expires_at)
+        return token_pair(user.username, family_id, jti, expires_at)
+
+    async def rotate(self, refresh_token: str) -> dict:
+        claims = await self._decode(refresh_token)
+        token = await self.repository.get_refresh_token(claims["jti"])
+        if token is None or token.expires_at <= utcnow():
+            raise invalid_refresh_token()
+        if token.revoked_at is not None:
+            # An already rotated token came back: treat the session as stolen.
+            await self.revoke_family(token.family_id)
+            raise invalid_refresh_token()
+        jti, expires_at = new_refresh_id()
+        await self.repository.rotate_refresh_token(token, jti, expires_at)
+        return token_pair(claims["sub"], token.family_id, jti, expires_at)
+
+    async def revoke(self, refresh_token: str) -> None:
+        claims = await self._decode(refresh_token)
+        await self.revoke_family(claims["fam"])
+
+    async def revoke_family(self, family_id: str) -> None:
+        # Access tokens of the family die at most JWT_EXPIRATION_SECONDS from now.
+        expires_at = utcnow() + timedelta(seconds=settings.JWT_EXPIRATION_SECONDS)
+        await self.repository.revoke_family(family_id, expires_at)
+        await revocation_list.revoke(family_id)
+
+    @staticmethod
+    async def _decode(refresh_token: str) -> dict:
+        try:
+            claims = await token_service.decode(refresh_token)
+        except JWTError:
+            raise invalid_refresh_token()
+        if claims.get("typ") != "refresh" or "jti" not in claims or "fam" not in claims:
+            raise invalid_refresh_token()
+        return claims
@@ -0,0 +1,68 @@
+import hashlib
+import uuid
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response, status
+
+from src.conf.config import settings
+from src.services.cache import build_cache
+
+
+class ResponseCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.versions = build_cache("contacts_version", maxsize)
+        self.bodies = build_cache("contacts_response", maxsize, ttl)
+        self.not_modified = 0
+
+    async def version(self, user_id: int) -> str:
+        version = await self.versions.get(str(user_id))
+        if version is None:
+            version = await self.bump(user_id)
+        return version
+
+    async def bump(self, user_id: int) -> str:
+        version = uuid.uuid4().hex
+        await self.versions.set(str(user_id), version)
+        return version
+
+    async def respond(
+        self,
+        request: Request,
+        user_id: int,
+        produce: Callable[[], Awaitable[tuple[bytes, dict]]],
+        extra: str = "",
+    ) -> Response:
+        version = await self.version(user_id)
+        raw_key = f"{user_id}:{version}:{request.url.path}?{request.url.query}:{extra}"
+        key = hashlib.sha1(raw_key.encode()).hexdigest()
+        etag = f'"{key}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if etag in _parse_etags(request.headers.get("if-none-match")):
+            self.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        cached = await self.bodies.get(key)
+        if cached is None:
+            body, extra_headers = await produce()
+            cached = {"body": body.decode(), "headers": extra_headers}
+            await self.bodies.set(key, cached)
+        return Response(
+            content=cached["body"],
+            media_type="application/json",
+            headers={**headers, **cached["headers"]},
+        )
+
+    def stats(self) -> dict:
+        return {**self.bodies.stats(), "not_modified": self.not_modified}
+
+
+def _parse_etags(header: str | None) -> list[str]:
+    if not header:
+        return []
+    return [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAXSIZE, settings.RESPONSE_CACHE_TTL_SECONDS
+)
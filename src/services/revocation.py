@@ -0,0 +1,152 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import math
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.tokens import TokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little") | 1
+        return [(a + i * b) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    CHANNEL = "token_revocations"
+
+    def __init__(self, capacity: int, error_rate: float, refresh_seconds: float, redis_url: str | None = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.filter = BloomFilter(capacity, error_rate)
+        self._recent: set[str] = set()
+        self._task: asyncio.Task | None = None
+        self._listener: asyncio.Task | None = None
+        self._redis = None
+        if redis_url:
+            from redis import asyncio as aioredis
+
+            self._redis = aioredis.from_url(redis_url)
+        self.loads = 0
+        self.db_checks = 0
+        self.false_positives = 0
+
+    async def load(self):
+        # Revocations made here while the table is being read are re-added
+        # after the swap, so they are never missing from the new filter.
+        self._recent = set()
+        async with sessionmanager.session() as db:
+            repo = TokenRepository(db)
+            await repo.purge_revocations()
+            revoked = await repo.active_revocations()
+        bloom = BloomFilter(max(self.capacity, len(revoked) * 2), self.error_rate)
+        for revoked_id in [*revoked, *self._recent]:
+            bloom.add(revoked_id)
+        self.filter = bloom
+        self.loads += 1
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        if self._redis is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        for task in (self._task, self._listener):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.load()
+            except Exception as e:
+                print(e)
+
+    async def _listen(self):
+        # Every worker subscribes to the revocations made by the others. The
+        # table is reloaded after each (re)subscribe, so nothing published
+        # while the subscription was down is missed.
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    await self.load()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.add(message["data"].decode())
+            except Exception:
+                logger.exception("Revocation subscription failed")
+                await asyncio.sleep(1)
+
+    def add(self, revoked_id: str) -> None:
+        self.filter.add(revoked_id)
+        self._recent.add(revoked_id)
+
+    async def revoke(self, revoked_id: str) -> None:
+        self.add(revoked_id)
+        if self._redis is not None:
+            try:
+                await self._redis.publish(self.CHANNEL, revoked_id)
+            except Exception:
+                logger.exception("Cannot publish revocation %s", revoked_id)
+
+    async def is_revoked(self, db: AsyncSession, revoked_id: str | None) -> bool:
+        # The filter has no false negatives, so a miss needs no query; a hit
+        # is confirmed against the token_revocations table.
+        if revoked_id is None or revoked_id not in self.filter:
+            return False
+        self.db_checks += 1
+        # Read from the primary: a lagging replica would not have the revocation yet.
+        revoked = await TokenRepository(db).is_revoked(revoked_id, primary=True)
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def stats(self) -> dict:
+        return {
+            "entries": self.filter.count,
+            "bits": self.filter.size,
+            "hashes": self.filter.hashes,
+            "loads": self.loads,
+            "db_checks": self.db_checks,
+            "false_positives": self.false_positives,
+        }
+
+
+revocation_list = RevocationList(
+    settings.REVOCATION_BLOOM_CAPACITY,
+    settings.REVOCATION_BLOOM_ERROR_RATE,
+    settings.REVOCATION_REFRESH_SECONDS,
+    settings.CACHE_REDIS_URL,
+)
@@ -0,0 +1,25 @@
+from typing import List, Optional
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+
+from src.schemas import ContactResponse
+
+contact_list_adapter = TypeAdapter(List[ContactResponse])
+
+
+def dump_contacts(contacts) -> bytes:
+    if contacts and isinstance(contacts[0], Row):
+        # Column rows already hold exactly the response fields.
+        return orjson.dumps([row._asdict() for row in contacts])
+    return contact_list_adapter.dump_json(
+        contact_list_adapter.validate_python(contacts, from_attributes=True)
+    )
+
+
+def contacts_response(contacts, headers: Optional[dict] = None) -> Response:
+    return Response(
+        content=dump_contacts(contacts), media_type="application/json", headers=headers
+    )
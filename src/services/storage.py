@@ -0,0 +1,122 @@
+import abc
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+
+import cloudinary
+import cloudinary.api
+import cloudinary.uploader
+
+from src.conf.config import settings
+from src.services.thumbnails import ThumbnailStore, thumbnail_store
+
+
+def ensure_writable(path: Path) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    if not os.access(path, os.W_OK):
+        raise PermissionError(f"{path} is not writable")
+
+
+class StorageBackend(abc.ABC):
+    # Backends that render their own sizes get the original upload.
+    keeps_original = False
+
+    @abc.abstractmethod
+    async def save(self, key: str, data: bytes, content_type: str) -> str:
+        pass
+
+    @abc.abstractmethod
+    async def check(self) -> None:
+        pass
+
+
+class CloudinaryStorage(StorageBackend):
+    def __init__(self, cloud_name, api_key, api_secret):
+        cloudinary.config(
+            cloud_name=cloud_name,
+            api_key=api_key,
+            api_secret=api_secret,
+            secure=True,
+        )
+
+    async def save(self, key: str, data: bytes, content_type: str) -> str:
+        public_id = f"RestApp/{key}"
+        r = await asyncio.to_thread(
+            cloudinary.uploader.upload, io.BytesIO(data), public_id=public_id, overwrite=True
+        )
+        return cloudinary.CloudinaryImage(public_id).build_url(
+            width=settings.AVATAR_SIZE,
+            height=settings.AVATAR_SIZE,
+            crop="fill",
+            version=r.get("version"),
+        )
+
+    async def check(self) -> None:
+        await asyncio.to_thread(cloudinary.api.ping)
+
+
+class LocalStorage(StorageBackend):
+    EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
+
+    def __init__(self, root: Path, base_url: str):
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+
+    def path_for(self, key: str, content_type: str) -> Path:
+        name = hashlib.sha256(key.encode()).hexdigest()[:32]
+        path = (self.root / f"{name}.{self.EXTENSIONS.get(content_type, 'bin')}").resolve()
+        if path.parent != self.root:
+            raise ValueError(f"{path} is outside of {self.root}")
+        return path
+
+    async def save(self, key: str, data: bytes, content_type: str) -> str:
+        path = self.path_for(key, content_type)
+        filename = path.name
+        await asyncio.to_thread(self._write, path, data)
+        return f"{self.base_url}/{filename}?v={hashlib.sha1(data).hexdigest()[:12]}"
+
+    async def check(self) -> None:
+        await asyncio.to_thread(ensure_writable, self.root)
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+            tmp.write(data)
+        # Served as static files, possibly by another process.
+        os.chmod(tmp.name, 0o644)
+        Path(tmp.name).replace(path)
+
+
+class ThumbnailStorage(StorageBackend):
+    keeps_original = True
+
+    def __init__(self, store: ThumbnailStore, base_url: str, size: int):
+        if size not in store.sizes:
+            raise ValueError(f"Avatar size {size} is not among the rendered sizes {store.sizes}")
+        self.store = store
+        self.base_url = base_url.rstrip("/")
+        self.size = size
+
+    async def save(self, key: str, data: bytes, content_type: str) -> str:
+        digest = await self.store.put(data)
+        return f"{self.base_url}/{digest}/{self.size}"
+
+    async def check(self) -> None:
+        await asyncio.to_thread(ensure_writable, self.store.root)
+
+
+def build_storage() -> StorageBackend:
+    if settings.AVATAR_STORAGE == "local":
+        return LocalStorage(settings.AVATAR_LOCAL_DIR, settings.AVATAR_LOCAL_BASE_URL)
+    if settings.AVATAR_STORAGE == "thumbnails":
+        return ThumbnailStorage(
+            thumbnail_store, settings.AVATAR_THUMBNAIL_BASE_URL, settings.AVATAR_SIZE
+        )
+    return CloudinaryStorage(settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET)
+
+
+avatar_storage = build_storage()
@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+from src.conf.config import settings
+from src.services.cache import MemoryCache
+
+
+def render_thumbnails(data: bytes, sizes: list[int]) -> dict[int, bytes]:
+    thumbnails = {}
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for size in sorted(sizes, reverse=True):
+            thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            thumbnail.save(output, format="JPEG", quality=85, optimize=True)
+            thumbnails[size] = output.getvalue()
+    return thumbnails
+
+
+class ThumbnailStore:
+    def __init__(self, root: Path, sizes: list[int], cache_maxsize: int):
+        self.root = Path(root)
+        self.sizes = sorted(set(sizes))
+        self.cache = MemoryCache(cache_maxsize)
+
+    def path(self, digest: str, size: int) -> Path:
+        return self.root / digest[:2] / digest / f"{size}.jpg"
+
+    async def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self._store, digest, data)
+        return digest
+
+    async def get(self, digest: str, size: int) -> Optional[bytes]:
+        key = f"{digest}/{size}"
+        data = await self.cache.get(key)
+        if data is None:
+            try:
+                data = await asyncio.to_thread(self.path(digest, size).read_bytes)
+            except FileNotFoundError:
+                return None
+            await self.cache.set(key, data)
+        return data
+
+    def _store(self, digest: str, data: bytes) -> None:
+        # Same bytes, same digest: thumbnails are only ever rendered once.
+        if all(self.path(digest, size).is_file() for size in self.sizes):
+            return
+        for size, thumbnail in render_thumbnails(data, self.sizes).items():
+            path = self.path(digest, size)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp name of its own, so concurrent uploads of the same image
+            # (or other workers) never write into each other's file.
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+                tmp.write(thumbnail)
+            Path(tmp.name).replace(path)
+
+
+thumbnail_store = ThumbnailStore(
+    settings.AVATAR_THUMBNAIL_DIR,
+    # AVATAR_SIZE is the size stored on the user, so it is always rendered.
+    [*settings.AVATAR_THUMBNAIL_SIZES, settings.AVATAR_SIZE],
+    settings.AVATAR_THUMBNAIL_CACHE_MAXSIZE,
+)
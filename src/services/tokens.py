@@ -0,0 +1,69 @@
+import hashlib
+import time
+from pathlib import Path
+from typing import Optional
+
+from jose import jwk, jwt
+
+from src.conf.config import settings
+from src.services.cache import MemoryCache
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+
+class TokenService:
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str,
+        private_key_file: Optional[str] = None,
+        public_key_file: Optional[str] = None,
+        cache_maxsize: int = 10000,
+    ):
+        self.algorithm = algorithm
+        self.kid = None
+        if algorithm in ASYMMETRIC_ALGORITHMS:
+            if not private_key_file:
+                raise ValueError(f"JWT_PRIVATE_KEY_FILE is required for {algorithm}")
+            self.signing_key = jwk.construct(Path(private_key_file).read_text(), algorithm)
+            if public_key_file:
+                public_pem = Path(public_key_file).read_text().encode()
+            else:
+                public_pem = self.signing_key.public_key().to_pem()
+            self.verifying_key = jwk.construct(public_pem, algorithm)
+            self.kid = hashlib.sha256(public_pem).hexdigest()[:16]
+        else:
+            # Parsed once instead of on every jwt.encode / jwt.decode call.
+            self.signing_key = self.verifying_key = jwk.construct(secret, algorithm)
+        self.cache = MemoryCache(cache_maxsize)
+
+    def encode(self, claims: dict) -> str:
+        headers = {"kid": self.kid} if self.kid else None
+        return jwt.encode(claims, self.signing_key, algorithm=self.algorithm, headers=headers)
+
+    async def decode(self, token: str) -> dict:
+        claims = await self.cache.get(token)
+        if claims is not None:
+            return claims
+        claims = jwt.decode(token, self.verifying_key, algorithms=[self.algorithm])
+        # A verified token stays valid until exp, so it is not re-verified before then.
+        ttl = claims.get("exp", 0) - time.time()
+        if ttl > 0:
+            await self.cache.set(token, claims, ttl=ttl)
+        return claims
+
+    def jwks(self) -> dict:
+        if self.kid is None:
+            return {"keys": []}
+        key = self.verifying_key.to_dict()
+        key.update(kid=self.kid, use="sig", alg=self.algorithm)
+        return {"keys": [key]}
+
+
+token_service = TokenService(
+    settings.JWT_ALGORITHM,
+    settings.JWT_SECRET,
+    settings.JWT_PRIVATE_KEY_FILE,
+    settings.JWT_PUBLIC_KEY_FILE,
+    settings.JWT_VERIFY_CACHE_SIZE,
+)
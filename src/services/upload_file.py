@@ -1,23 +1,63 @@
-import cloudinary
-import cloudinary.uploader
+import asyncio
+import io
+
+from fastapi import HTTPException, UploadFile, status
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from src.conf.config import settings
+from src.services.storage import StorageBackend, avatar_storage
+
+def resize_avatar(data: bytes, size: int) -> bytes:
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=85, optimize=True)
+        return output.getvalue()
+
+def load_image(data: bytes) -> None:
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
 
 class UploadFileService:
-    def __init__(self, cloud_name, api_key, api_secret):
-        self.cloud_name = cloud_name
-        self.api_key = api_key
-        self.api_secret = api_secret
-        cloudinary.config(
-            cloud_name=self.cloud_name,
-            api_key=self.api_key,
-            api_secret=self.api_secret,
-            secure=True,
-        )
+    def __init__(self, storage: StorageBackend | None = None):
+        self.storage = storage or avatar_storage
+
+    async def upload_file(self, file: UploadFile, username: str) -> str:
+        try:
+            return await asyncio.wait_for(
+                self._upload(file, username), settings.AVATAR_UPLOAD_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Завантаження аватара перевищило ліміт часу",
+            )
+
+    async def _upload(self, file: UploadFile, username: str) -> str:
+        data = await self._read(file)
+        try:
+            if self.storage.keeps_original:
+                await asyncio.to_thread(load_image, data)
+                content_type = file.content_type or "application/octet-stream"
+            else:
+                data = await asyncio.to_thread(resize_avatar, data, settings.AVATAR_SIZE)
+                content_type = "image/jpeg"
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Файл не є зображенням",
+            )
+        return await self.storage.save(username, data, content_type)
 
     @staticmethod
-    def upload_file(file, username) -> str:
-        public_id = f"RestApp/{username}"
-        r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=r.get("version")
-        )
-        return src_url
+    async def _read(file: UploadFile) -> bytes:
+        buffer = bytearray()
+        while chunk := await file.read(settings.AVATAR_CHUNK_SIZE):
+            buffer.extend(chunk)
+            if len(buffer) > settings.AVATAR_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Файл аватара завеликий",
+                )
+        return bytes(buffer)
@@ -30,6 +30,9 @@ class UserService:
     async def confirmed_email(self, email: str):
         return await self.repository.confirmed_email(email)
     
+    async def update_password(self, email: str, hashed_password: str):
+        return await self.repository.update_password(email, hashed_password)
+
     async def update_avatar_url(self, email: str, url: str):
         return await self.repository.update_avatar_url(email, url)
 